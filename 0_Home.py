@@ -9,8 +9,8 @@ Main entry point - Home page
 import streamlit as st
 import pandas as pd
 
-# Import our custom data API module
-import data_api
+# Import our cached data module
+import data_cache
 
 # Set page configuration - this must be the first Streamlit command
 st.set_page_config(
@@ -39,13 +39,8 @@ Use the sidebar to navigate between pages:
 - Zero-value pattern analysis
 """)
 
-# Load the data using our API module
-@st.cache_data  # This decorator caches the data so we don't reload it every time
-def load_data():
-    """Wrapper function for caching data from data_api module."""
-    return data_api.load_data()
-
-datasource_df, timeseries_df = load_data()
+# Load the data and fruit statistics (cached and shared with the other pages)
+datasource_df, _, _, fruit_stats_df, overview = data_cache.load_bundle()
 
 # Display basic information about the data
 st.header("Data Overview")
@@ -61,19 +56,28 @@ with col1:
 
 with col2:
     st.subheader("Timeseries Table")
-    st.write(f"**Shape:** {timeseries_df.shape[0]} rows × {timeseries_df.shape[1]} columns")
-    st.write(f"**Time period:** {timeseries_df['timestamp'].min()} to {timeseries_df['timestamp'].max()}")
-    st.dataframe(timeseries_df.head(10))  # Show only first 10 rows
+    n_rows, n_columns = overview['timeseries_shape']
+    st.write(f"**Shape:** {n_rows} rows × {n_columns} columns")
+    st.write(f"**Time period:** {overview['time_min']} to {overview['time_max']}")
+    st.dataframe(overview['timeseries_preview'])  # Show only first 10 rows
 
 # Show meaningful statistics
 st.header("Dataset Statistics")
 
-# Get fruit statistics from API
-fruit_stats_df = data_api.calculate_fruit_statistics(datasource_df, timeseries_df)
-
 # Display the statistics table
 st.subheader("Fruit Value Statistics")
-st.dataframe(fruit_stats_df, use_container_width=True, hide_index=True)
+st.dataframe(
+    fruit_stats_df,
+    use_container_width=True,
+    hide_index=True,
+    column_config={
+        "Zero %": st.column_config.NumberColumn("Zero %", format="%.1f%%"),
+        "Min Value": st.column_config.NumberColumn("Min Value", format="%.2f"),
+        "Max Value": st.column_config.NumberColumn("Max Value", format="%.2f"),
+        "Mean Value": st.column_config.NumberColumn("Mean Value", format="%.2f"),
+        "Std Dev": st.column_config.NumberColumn("Std Dev", format="%.2f"),
+    }
+)
 
 # Display key insights
 st.subheader("Key Insights")
@@ -81,37 +85,31 @@ st.subheader("Key Insights")
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    most_zeros = fruit_stats_df.loc[
-        fruit_stats_df['Zero %'].str.rstrip('%').astype(float).idxmax()
-    ]
+    most_zeros = fruit_stats_df.loc[fruit_stats_df['Zero %'].idxmax()]
     st.metric(
         "Most Sparse",
         str(most_zeros['Fruit']),
-        str(most_zeros['Zero %']) + " zeros"
+        f"{most_zeros['Zero %']:.1f}% zeros"
     )
 
 with col2:
-    least_zeros = fruit_stats_df.loc[
-        fruit_stats_df['Zero %'].str.rstrip('%').astype(float).idxmin()
-    ]
+    least_zeros = fruit_stats_df.loc[fruit_stats_df['Zero %'].idxmin()]
     st.metric(
         "Most Active",
         str(least_zeros['Fruit']),
-        str(least_zeros['Zero %']) + " zeros"
+        f"{least_zeros['Zero %']:.1f}% zeros"
     )
 
 with col3:
-    highest_mean = fruit_stats_df.loc[
-        fruit_stats_df['Mean Value'].astype(float).idxmax()
-    ]
+    highest_mean = fruit_stats_df.loc[fruit_stats_df['Mean Value'].idxmax()]
     st.metric(
         "Highest Average Value",
         str(highest_mean['Fruit']),
-        str(highest_mean['Mean Value'])
+        f"{highest_mean['Mean Value']:.2f}"
     )
 
 with col4:
-    total_data_points = len(timeseries_df)
+    total_data_points = overview['timeseries_shape'][0]
     st.metric(
         "Total Measurements",
         f"{total_data_points:,}",
@@ -6,7 +6,12 @@ Data API Module
 Handles all database operations and data processing for the Fruit Analysis Dashboard
 """
 
+import importlib.util
+import os
 import sqlite3
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import warnings
 import numpy as np
@@ -19,32 +24,487 @@ try:
 except ImportError:
     Prophet = None
 
+try:
+    import adbc_driver_sqlite.dbapi as adbc_sqlite
+except ImportError:
+    adbc_sqlite = None
+
+try:
+    import pyarrow
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pyarrow = None
+    pc = None
+    pq = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    from tsdownsample import MinMaxLTTBDownsampler
+except ImportError:
+    MinMaxLTTBDownsampler = None
+
+# statsmodels is only imported when an STL forecast runs; it is slow to import
+_HAS_STATSMODELS = importlib.util.find_spec("statsmodels") is not None
+
+# Read-only tuning applied to every connection used for loading
+_SQLITE_READ_PRAGMAS = (
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY"
+)
+
+# Shared sqlite3 connections (one per database file) for small serial queries;
+# the lock serializes their use across Streamlit session threads
+_connections = {}
+_connections_lock = threading.RLock()
+
+# Parquet snapshot format; bump whenever load_data changes the stored
+# columns or dtypes so snapshots written by older code are rebuilt
+_SNAPSHOT_VERSION = b"1"
+_SNAPSHOT_VERSION_KEY = b"fruit_snapshot_version"
+
+# Row count above which the numba kernels are worth their compile/dispatch cost
+_NUMBA_MIN_ROWS = 100_000
+
+
+def _arrow_to_pandas(table):
+    """
+    Convert an Arrow table to pandas, parsing a text 'timestamp' column in Arrow.
+    
+    Arrow's ISO-8601 cast runs in C++ on the string buffers, so load_data does
+    not need to parse the column again in pandas. If the cast fails, the
+    column is left as text and pandas parses it later.
+    
+    Args:
+        table (pyarrow.Table): Table fetched through ADBC
+    
+    Returns:
+        pd.DataFrame: Table contents with numpy-backed columns
+    """
+    index = table.schema.get_field_index('timestamp')
+    if pc is not None and index >= 0 and pyarrow.types.is_string(table.schema.field(index).type):
+        try:
+            parsed = pc.cast(table.column(index), pyarrow.timestamp('us'))
+            table = table.set_column(index, 'timestamp', parsed)
+        except pyarrow.ArrowInvalid:
+            pass
+    return table.to_pandas()
+
+
+def _read_table(db_path, table_name):
+    """
+    Read a full table on its own connection, so tables can load in parallel threads.
+    
+    Uses ADBC (columnar Arrow reads, no Python row tuples) when the driver is
+    installed and sqlite3 + read_sql_query otherwise.
+    
+    Args:
+        db_path (str): Path to the SQLite database file
+        table_name (str): Name of the table to read
+    
+    Returns:
+        pd.DataFrame: Table contents with numpy-backed columns
+    """
+    query = f"SELECT * FROM {table_name}"
+    
+    if adbc_sqlite is not None:
+        with adbc_sqlite.connect(db_path) as connection, connection.cursor() as cursor:
+            for pragma in _SQLITE_READ_PRAGMAS:
+                cursor.execute(pragma)
+            cursor.execute(query)
+            return _arrow_to_pandas(cursor.fetch_arrow_table())
+    
+    connection = sqlite3.connect(db_path)
+    try:
+        for pragma in _SQLITE_READ_PRAGMAS:
+            connection.execute(pragma)
+        # Parse a 'timestamp' column while reading, like the Arrow path does
+        columns = [row[1] for row in connection.execute(f"PRAGMA table_info({table_name})")]
+        parse_dates = {'timestamp': {'format': 'ISO8601'}} if 'timestamp' in columns else None
+        return pd.read_sql_query(query, connection, parse_dates=parse_dates)
+    finally:
+        connection.close()
+
+
+def _get_connection(db_path):
+    """
+    Get the shared sqlite3 connection for a database file, opening it once.
+    
+    The read pragmas are applied when the connection is opened, so later
+    queries skip both the connect and the pragma setup. Callers must hold
+    _connections_lock while using the connection.
+    
+    Args:
+        db_path (str): Path to the SQLite database file
+    
+    Returns:
+        sqlite3.Connection: Open connection usable from any thread
+    """
+    key = os.path.abspath(db_path)
+    with _connections_lock:
+        connection = _connections.get(key)
+        if connection is None:
+            connection = sqlite3.connect(key, check_same_thread=False)
+            for pragma in _SQLITE_READ_PRAGMAS:
+                connection.execute(pragma)
+            _connections[key] = connection
+        return connection
+
+
+def _snapshot_paths(db_path):
+    """
+    Get the Parquet snapshot file paths that sit next to the database file.
+    
+    Args:
+        db_path (str): Path to the SQLite database file
+    
+    Returns:
+        tuple: (datasource_path, timeseries_path)
+    """
+    folder = os.path.dirname(os.path.abspath(db_path))
+    return (
+        os.path.join(folder, "datasource.parquet"),
+        os.path.join(folder, "timeseries.parquet")
+    )
+
+
+def _read_snapshot(db_path):
+    """
+    Read the Parquet snapshot if it exists and is newer than the database.
+    
+    A snapshot shipped without the database file is used as is, so a
+    deployment can run from the Parquet files alone. Snapshots whose stored
+    format version differs from _SNAPSHOT_VERSION are ignored.
+    
+    Args:
+        db_path (str): Path to the SQLite database file
+    
+    Returns:
+        tuple or None: (datasource_df, timeseries_df), or None if the snapshot
+            is missing, stale, of another format version or pyarrow is not installed
+    """
+    if pyarrow is None:
+        return None
+    
+    try:
+        paths = _snapshot_paths(db_path)
+        if os.path.exists(db_path):
+            db_mtime = os.path.getmtime(db_path)
+            if any(os.path.getmtime(path) < db_mtime for path in paths):
+                return None
+        # Only the footer is read here
+        for path in paths:
+            metadata = pq.read_schema(path).metadata or {}
+            if metadata.get(_SNAPSHOT_VERSION_KEY) != _SNAPSHOT_VERSION:
+                return None
+        return tuple(_read_parquet(path) for path in paths)
+    except (OSError, ValueError):
+        return None
+
+
+def _read_parquet(path):
+    """
+    Read one snapshot file through a memory map.
+    
+    The file is mapped instead of copied into a heap buffer and its column
+    chunks are fetched in coalesced, threaded reads; Arrow buffers are
+    released column by column while converting, which keeps the peak at
+    roughly one copy of the table.
+    
+    Args:
+        path (str): Parquet file path
+    
+    Returns:
+        pd.DataFrame: The stored table, with its pandas dtypes restored
+    """
+    table = pq.read_table(path, memory_map=True, use_threads=True, pre_buffer=True)
+    return table.to_pandas(self_destruct=True, split_blocks=True)
+
+
+def _write_snapshot(db_path, datasource_df, timeseries_df):
+    """
+    Write both tables to Parquet so the next cold start can skip SQLite.
+    
+    Each file records _SNAPSHOT_VERSION in its schema metadata. Failures
+    (e.g. a read-only folder or a table Arrow cannot convert) are ignored;
+    the snapshot is only a cache and must never fail the load.
+    
+    Args:
+        db_path (str): Path to the SQLite database file
+        datasource_df (pd.DataFrame): Processed datasource table
+        timeseries_df (pd.DataFrame): Processed timeseries table
+    """
+    if pyarrow is None:
+        return
+    
+    for df, path in zip((datasource_df, timeseries_df), _snapshot_paths(db_path)):
+        tmp_path = None
+        try:
+            # Unique temp name per writer so concurrent sessions cannot clobber each other
+            with tempfile.NamedTemporaryFile(
+                dir=os.path.dirname(path), prefix=f"{os.path.basename(path)}.", suffix=".tmp", delete=False
+            ) as tmp_file:
+                tmp_path = tmp_file.name
+            table = pyarrow.Table.from_pandas(df, preserve_index=False)
+            table = table.replace_schema_metadata({
+                **(table.schema.metadata or {}),
+                _SNAPSHOT_VERSION_KEY: _SNAPSHOT_VERSION
+            })
+            pq.write_table(table, tmp_path, compression="zstd")
+            os.replace(tmp_path, path)
+        except (OSError, ValueError, pyarrow.ArrowException):
+            if tmp_path is not None and os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+
+def _sort_by_fruit(timeseries_df):
+    """
+    Group timeseries rows by fruit, keeping timestamp order within each fruit.
+    
+    Args:
+        timeseries_df (pd.DataFrame): Timeseries data with 'datasource_id'
+    
+    Returns:
+        pd.DataFrame: Timeseries data sorted by datasource_id (unchanged if it already is)
+    """
+    if timeseries_df['datasource_id'].is_monotonic_increasing:
+        return timeseries_df
+    return timeseries_df.sort_values('datasource_id', kind='stable', ignore_index=True)
+
+
+def fruit_row_offsets(timeseries_df):
+    """
+    Record where each fruit's rows start in a timeseries sorted by datasource_id.
+    
+    Rows for fruit id i are timeseries_df.iloc[offsets[i]:offsets[i + 1]].
+    
+    Args:
+        timeseries_df (pd.DataFrame): Timeseries data sorted by datasource_id,
+            as returned by load_data
+    
+    Returns:
+        np.ndarray: Row offsets, of length (largest fruit id + 2)
+    
+    Raises:
+        ValueError: If timeseries_df is not sorted by datasource_id
+    """
+    if not timeseries_df['datasource_id'].is_monotonic_increasing:
+        raise ValueError("timeseries_df must be sorted by datasource_id; load it with load_data()")
+    
+    ids = timeseries_df['datasource_id'].to_numpy()
+    if len(ids) == 0:
+        return np.zeros(1, dtype=np.int64)
+    return np.searchsorted(ids, np.arange(ids.max() + 2))
+
+
+def _rows_for_fruit_ids(timeseries_df, fruit_ids, fruit_offsets):
+    """
+    Get row positions for the given fruit ids using precomputed row offsets.
+    
+    Args:
+        timeseries_df (pd.DataFrame): Timeseries data
+        fruit_ids (np.ndarray): Fruit ids to select; repeated ids are selected once
+        fruit_offsets (np.ndarray): Output of fruit_row_offsets for timeseries_df
+    
+    Returns:
+        np.ndarray or None: Row positions, or None if the offsets do not
+            belong to timeseries_df (e.g. it is a filtered copy)
+    """
+    if fruit_offsets[-1] != len(timeseries_df):
+        return None
+    
+    ids = timeseries_df['datasource_id'].to_numpy()
+    ranges = []
+    for fruit_id in np.unique(fruit_ids):
+        if fruit_id < 0 or fruit_id + 1 >= len(fruit_offsets):
+            continue
+        start, end = fruit_offsets[fruit_id], fruit_offsets[fruit_id + 1]
+        if start == end:
+            continue
+        # Cheap consistency check that the offsets belong to this frame
+        if ids[start] != fruit_id or ids[end - 1] != fruit_id:
+            return None
+        ranges.append(np.arange(start, end))
+    
+    return np.concatenate(ranges) if ranges else np.array([], dtype=np.int64)
+
 
 def load_data(db_path="db.sqlite"):
     """
     Connects to SQLite database and loads both tables into pandas DataFrames.
     
+    A Parquet snapshot of the processed tables is kept next to the database and
+    is used instead of SQLite as long as it is newer than the database file, or
+    on its own when the database file is not present.
+    
     Args:
         db_path (str): Path to the SQLite database file
     
     Returns:
         tuple: (datasource_df, timeseries_df)
             - datasource_df: DataFrame with fruit metadata (id, name, x, y)
-            - timeseries_df: DataFrame with time-series data (datasource_id, timestamp, value)
+            - timeseries_df: DataFrame with time-series data (datasource_id, timestamp, value),
+              with 'timestamp' already parsed to datetime64 and sorted by
+              datasource_id (see fruit_row_offsets)
     """
-    # Connect to the database
-    connection = sqlite3.connect(db_path)
+    # Fastest path: typed Parquet snapshot written by a previous load
+    snapshot = _read_snapshot(db_path)
+    if snapshot is not None:
+        datasource_df, timeseries_df = snapshot
+        return datasource_df, _sort_by_fruit(timeseries_df)
+
+    # Read both tables in parallel; SQLite releases the GIL while stepping rows
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # Datasource table (fruit metadata with x, y coordinates)
+        datasource_future = executor.submit(_read_table, db_path, "datasource")
+        # Timeseries table (time-series values for each fruit)
+        timeseries_future = executor.submit(_read_table, db_path, "timeseries")
+        datasource_df = datasource_future.result()
+        timeseries_df = timeseries_future.result()
+
+    # Parse timestamps once here so callers get datetime64 values
+    # (the ADBC path already parsed them in Arrow)
+    if not pd.api.types.is_datetime64_any_dtype(timeseries_df['timestamp']):
+        timeseries_df['timestamp'] = pd.to_datetime(
+            timeseries_df['timestamp'],
+            format="ISO8601",
+            cache=True
+        )
+
+    # Downcast to compact dtypes; ids share int32 so merges stay vectorized
+    datasource_df = datasource_df.astype({'id': 'int32', 'x': 'float32', 'y': 'float32'})
+    datasource_df['name'] = datasource_df['name'].astype('category')
+    timeseries_df = timeseries_df.astype({'datasource_id': 'int32', 'value': 'float32'})
+
+    # Group rows by fruit (timestamp order is kept within each fruit)
+    timeseries_df = _sort_by_fruit(timeseries_df)
+
+    _write_snapshot(db_path, datasource_df, timeseries_df)
+
+    return datasource_df, timeseries_df
+
+
+def load_bundle(db_path="db.sqlite"):
+    """
+    Load both tables, the per-fruit statistics and small overview artifacts in one call.
     
-    # Load the datasource table (fruit metadata with x, y coordinates)
-    datasource_df = pd.read_sql_query("SELECT * FROM datasource", connection)
+    Meant to be wrapped in a single cache so everything derived from the data
+    is built once together with the data it depends on.
     
-    # Load the timeseries table (time-series values for each fruit)
-    timeseries_df = pd.read_sql_query("SELECT * FROM timeseries", connection)
+    Args:
+        db_path (str): Path to the SQLite database file
     
-    # Close the connection
-    connection.close()
+    Returns:
+        tuple: (datasource_df, timeseries_df, fruit_offsets, fruit_stats_df, overview)
+            - timeseries_df: As from load_data, plus a categorical 'name' column
+              (see add_fruit_names) so per-fruit selections need no lookup
+            - fruit_offsets: Output of fruit_row_offsets for timeseries_df; pass it
+              to get_timeseries_for_fruits to slice fruits instead of scanning
+            - fruit_stats_df: Same table as calculate_fruit_statistics, aggregated in
+              SQLite (or in memory when only the Parquet snapshot is present)
+            - overview (dict): Precomputed values for overview displays, taken
+              from the timeseries table as stored (without the 'name' column):
+                - timeseries_shape: (rows, columns) of the stored table
+                - timeseries_preview: First 10 rows
+                - time_min / time_max: First and last timestamp
+    """
+    datasource_df, timeseries_df = load_data(db_path)
+    overview = {
+        'timeseries_shape': timeseries_df.shape,
+        'timeseries_preview': timeseries_df.head(10),
+        'time_min': timeseries_df['timestamp'].min(),
+        'time_max': timeseries_df['timestamp'].max()
+    }
+    timeseries_df = add_fruit_names(timeseries_df, datasource_df)
+    fruit_offsets = fruit_row_offsets(timeseries_df)
+    if os.path.exists(db_path):
+        fruit_stats_df = _format_fruit_statistics(datasource_df, load_fruit_aggregates(db_path))
+    else:
+        # Running from the Parquet snapshot alone; aggregate in memory
+        fruit_stats_df = calculate_fruit_statistics(datasource_df, timeseries_df)
+    return datasource_df, timeseries_df, fruit_offsets, fruit_stats_df, overview
 
-    return datasource_df, timeseries_df
+
+def load_fruit_aggregates(db_path="db.sqlite"):
+    """
+    Compute per-fruit counts and non-zero value statistics inside SQLite.
+    
+    Only one row per fruit is transferred to Python. The standard deviation
+    is computed in two passes (mean first, then squared deviations) and uses
+    the sample (n - 1) definition, same as pandas. Runs as a covering-index
+    scan once migrate_db.py has created ix_ts_dsid_value.
+    
+    Args:
+        db_path (str): Path to the SQLite database file
+    
+    Returns:
+        pd.DataFrame: Indexed by datasource_id with columns
+            [total, zeros, min, max, mean, std]
+    """
+    query = """
+        WITH non_zero AS (
+            SELECT datasource_id, AVG(value) AS mean, COUNT(*) AS n
+            FROM timeseries
+            WHERE value > 0
+            GROUP BY datasource_id
+        )
+        SELECT
+            t.datasource_id,
+            COUNT(*) AS total,
+            SUM(CASE WHEN t.value = 0 THEN 1 ELSE 0 END) AS zeros,
+            MIN(CASE WHEN t.value > 0 THEN t.value END) AS min,
+            MAX(CASE WHEN t.value > 0 THEN t.value END) AS max,
+            nz.mean AS mean,
+            SUM(CASE WHEN t.value > 0 THEN (t.value - nz.mean) * (t.value - nz.mean) END)
+                / NULLIF(nz.n - 1, 0) AS variance
+        FROM timeseries AS t
+        LEFT JOIN non_zero AS nz ON nz.datasource_id = t.datasource_id
+        GROUP BY t.datasource_id
+    """
+    
+    with _connections_lock:
+        aggregates = pd.read_sql_query(query, _get_connection(db_path))
+    
+    aggregates['std'] = np.sqrt(aggregates.pop('variance').astype('float64'))
+    return aggregates.set_index('datasource_id')
+
+
+def _aggregate_fruit_values(timeseries_df):
+    """
+    Aggregate per-fruit counts and non-zero value statistics in memory.
+    
+    Same result as load_fruit_aggregates, for when only the Parquet
+    snapshot is available.
+    
+    Args:
+        timeseries_df (pd.DataFrame): Timeseries data with 'datasource_id' and 'value'
+    
+    Returns:
+        pd.DataFrame: Indexed by datasource_id with columns
+            [total, zeros, min, max, mean, std]
+    """
+    values = timeseries_df['value']
+    
+    counts = (
+        timeseries_df.assign(_is_zero=_zero_mask(values))
+        .groupby('datasource_id', sort=False, observed=True)['_is_zero']
+        .agg(total='size', zeros='sum')
+    )
+    non_zero_stats = (
+        timeseries_df[values > 0]
+        .groupby('datasource_id', sort=False, observed=True)['value']
+        .agg(['min', 'max', 'mean', 'std'])
+    )
+    
+    return counts.join(non_zero_stats)
 
 
 def calculate_mean_values(timeseries_df):
@@ -57,7 +517,7 @@ def calculate_mean_values(timeseries_df):
     Returns:
         pd.DataFrame: DataFrame with columns [id, mean_value]
     """
-    mean_values = timeseries_df.groupby('datasource_id')['value'].mean().reset_index()
+    mean_values = timeseries_df.groupby('datasource_id', observed=True)['value'].mean().reset_index()
     mean_values.columns = ['id', 'mean_value']
     return mean_values
 
@@ -73,8 +533,11 @@ def merge_datasource_with_mean(datasource_df, timeseries_df):
     Returns:
         pd.DataFrame: Datasource data with additional 'mean_value' column
     """
-    mean_values = calculate_mean_values(timeseries_df)
-    return datasource_df.merge(mean_values, on='id', how='left')
+    # Map per-id means straight onto the ids instead of a second hash join
+    mean_by_id = timeseries_df.groupby('datasource_id', sort=False, observed=True)['value'].mean()
+    merged = datasource_df.copy()
+    merged['mean_value'] = merged['id'].map(mean_by_id)
+    return merged
 
 
 def filter_by_fruit_names(datasource_df, fruit_names):
@@ -88,41 +551,286 @@ def filter_by_fruit_names(datasource_df, fruit_names):
     Returns:
         pd.DataFrame: Filtered datasource data
     """
-    return datasource_df[datasource_df['name'].isin(fruit_names)]
+    names = datasource_df['name']
+    if isinstance(names.dtype, pd.CategoricalDtype):
+        # Compare integer category codes instead of hashing strings per row
+        wanted_codes = names.cat.categories.get_indexer(list(fruit_names))
+        mask = np.isin(names.cat.codes.to_numpy(), wanted_codes[wanted_codes >= 0])
+        return datasource_df[mask]
+    return datasource_df[names.isin(fruit_names)]
+
+
+def add_fruit_names(timeseries_df, datasource_df):
+    """
+    Attach each row's fruit name using an id -> name lookup instead of a merge.
+    
+    Args:
+        timeseries_df (pd.DataFrame): Timeseries data with 'datasource_id'
+        datasource_df (pd.DataFrame): Datasource data for fruit lookup
+    
+    Returns:
+        pd.DataFrame: Timeseries data with an added 'name' column using the
+            same dtype as datasource_df['name'] (row order is kept)
+    """
+    id_to_name = datasource_df.set_index('id')['name']
+    return timeseries_df.assign(
+        name=timeseries_df['datasource_id'].map(id_to_name).astype(datasource_df['name'].dtype)
+    )
+
+
+def get_name_to_id(datasource_df):
+    """
+    Build a fruit name -> id lookup.
+    
+    Args:
+        datasource_df (pd.DataFrame): Datasource data
+    
+    Returns:
+        dict: {fruit name: fruit id}
+    """
+    return dict(zip(datasource_df['name'].tolist(), datasource_df['id'].tolist()))
+
+
+def ids_for_names(fruit_names, name_to_id):
+    """
+    Translate fruit names to their ids with one dict lookup per name.
+    
+    Args:
+        fruit_names (list): Fruit names; unknown names are skipped
+        name_to_id (dict): Lookup from get_name_to_id
+    
+    Returns:
+        np.ndarray: int32 array of fruit ids
+    """
+    return np.fromiter(
+        (name_to_id[name] for name in fruit_names if name in name_to_id),
+        dtype=np.int32
+    )
 
 
-def get_timeseries_for_fruits(timeseries_df, datasource_df, fruit_names):
+def get_timeseries_for_fruits(timeseries_df, datasource_df, fruit_names, name_to_id=None,
+                              fruit_offsets=None):
     """
     Get timeseries data for specific fruits, merged with fruit names.
     
+    If timeseries_df already carries a 'name' column (see add_fruit_names),
+    this is a pure row selection with no per-call name lookup.
+    
     Args:
-        timeseries_df (pd.DataFrame): Full timeseries data
+        timeseries_df (pd.DataFrame): Full timeseries data (parsed timestamps)
         datasource_df (pd.DataFrame): Datasource data for fruit lookup
-        fruit_names (list): List of fruit names to include
+        fruit_names (list or None): List of fruit names to include; None
+            selects every fruit without building a row selection
+        name_to_id (dict, optional): Precomputed lookup from get_name_to_id;
+            skips scanning datasource_df for the selected ids
+        fruit_offsets (np.ndarray, optional): fruit_row_offsets(timeseries_df);
+            selected fruits are sliced by row range instead of scanning every id,
+            and a selection covering every fruit returns the table as is
     
     Returns:
         pd.DataFrame: Timeseries data with fruit names, filtered to selected fruits
+    
+    Raises:
+        TypeError: If 'timestamp' has not been parsed to datetime64
     """
-    # Filter datasource to get IDs of selected fruits
-    filtered_datasource = filter_by_fruit_names(datasource_df, fruit_names)
-    selected_ids = filtered_datasource['id'].tolist()
+    if not pd.api.types.is_datetime64_any_dtype(timeseries_df['timestamp']):
+        raise TypeError(
+            "timeseries_df['timestamp'] must be datetime64; load it with load_data()"
+        )
     
-    # Filter timeseries to only include selected fruits
-    filtered_timeseries = timeseries_df[timeseries_df['datasource_id'].isin(selected_ids)]
+    # Get IDs of selected fruits
+    if fruit_names is None:
+        selected_ids = None
+    elif name_to_id is not None:
+        selected_ids = ids_for_names(fruit_names, name_to_id)
+    else:
+        selected_ids = filter_by_fruit_names(datasource_df, fruit_names)['id'].to_numpy(dtype=np.int32)
     
-    # Merge with datasource to get fruit names
-    merged_data = filtered_timeseries.merge(
-        datasource_df[['id', 'name']],
-        left_on='datasource_id',
-        right_on='id'
-    )
+    # A selection covering every fruit present in the timeseries is the whole
+    # table; datasource_df may be a subset, so it cannot tell
+    if selected_ids is not None and fruit_offsets is not None and fruit_offsets[-1] == len(timeseries_df):
+        present_ids = np.flatnonzero(np.diff(fruit_offsets))
+        if np.isin(present_ids, selected_ids).all():
+            selected_ids = None
     
-    # Convert timestamp to datetime
-    merged_data['timestamp'] = pd.to_datetime(merged_data['timestamp'])
+    # Filter timeseries to only include selected fruits: slice the per-fruit
+    # row ranges when offsets are given, else hashed int membership
+    rows = None
+    if selected_ids is not None and fruit_offsets is not None:
+        rows = _rows_for_fruit_ids(timeseries_df, selected_ids, fruit_offsets)
+    if selected_ids is None:
+        filtered_timeseries = timeseries_df
+    elif rows is not None:
+        filtered_timeseries = timeseries_df.take(rows)
+    else:
+        mask = np.isin(timeseries_df['datasource_id'].to_numpy(), selected_ids)
+        filtered_timeseries = timeseries_df[mask]
+    
+    # Names are already attached when the frame came from add_fruit_names
+    if 'name' in filtered_timeseries.columns:
+        merged_data = filtered_timeseries.reset_index(drop=True)
+    else:
+        merged_data = add_fruit_names(filtered_timeseries, datasource_df).reset_index(drop=True)
     
     return merged_data
 
 
+def _minmax_indices(y, n_out):
+    """
+    Pick the positions of each bucket's minimum and maximum value.
+    
+    NumPy fallback for MinMaxLTTBDownsampler: splits the series into
+    n_out // 2 equal buckets and keeps both extremes of every bucket, which
+    preserves the visual envelope of a line chart.
+    
+    Args:
+        y (np.ndarray): Values in x order
+        n_out (int): Approximate number of points to keep
+    
+    Returns:
+        np.ndarray: Sorted positions into y
+    """
+    n_buckets = max(n_out // 2, 1)
+    bucket = np.arange(y.size) * n_buckets // y.size
+    order = np.lexsort((y, bucket))
+    ends = np.searchsorted(bucket[order], np.arange(1, n_buckets + 1))
+    starts = np.concatenate(([0], ends[:-1]))
+    return np.unique(np.concatenate((order[starts], order[ends - 1])))
+
+
+def downsample_for_plot(df, x='timestamp', y='value', group='name', n_out=2000):
+    """
+    Reduce each group's series to about n_out points for line charts.
+    
+    Uses tsdownsample's MinMaxLTTB when it is installed and a min/max bucket
+    selection otherwise. Groups with at most n_out points are kept whole.
+    Only meant for drawing lines; histograms and box plots need every row.
+    
+    Args:
+        df (pd.DataFrame): Data to plot
+        x (str): Column on the x axis (sorted within each group)
+        y (str): Column on the y axis
+        group (str): Column splitting the data into traces
+        n_out (int): Maximum number of points per group
+    
+    Returns:
+        pd.DataFrame: Subset of df rows, in their original order
+    """
+    if len(df) <= n_out:
+        return df
+    
+    x_values = df[x].to_numpy()
+    if np.issubdtype(x_values.dtype, np.datetime64):
+        x_values = x_values.view(np.int64)
+    y_values = df[y].to_numpy(dtype=np.float64)
+    
+    keep = []
+    for rows in df.groupby(group, sort=False, observed=True).indices.values():
+        if rows.size <= n_out:
+            keep.append(rows)
+            continue
+        rows = rows[np.argsort(x_values[rows], kind='stable')]
+        if MinMaxLTTBDownsampler is not None:
+            picked = MinMaxLTTBDownsampler().downsample(x_values[rows], y_values[rows], n_out=n_out)
+        else:
+            picked = _minmax_indices(y_values[rows], n_out)
+        keep.append(rows[picked])
+    
+    return df.take(np.sort(np.concatenate(keep)))
+
+
+def histogram_by_group(df, value='value', group='name', nbins=50):
+    """
+    Count values per group into shared, equal-width bins.
+    
+    Binning on the server lets a chart ship nbins bars per group instead of
+    every row. All groups use the same edges (spanning the overall range) so
+    overlaid bars line up; the last bin includes the maximum, as in np.histogram.
+    
+    Args:
+        df (pd.DataFrame): Data to bin
+        value (str): Column to bin (NaN values are skipped)
+        group (str): Column splitting the data into series
+        nbins (int): Number of bins
+    
+    Returns:
+        pd.DataFrame: Columns [group, 'bin_start', 'bin_center', 'bin_width',
+            'count'], nbins rows per group, groups in order of appearance
+    """
+    codes, groups = pd.factorize(df[group], sort=False)
+    values = df[value].to_numpy(dtype=np.float64)
+    keep = ~np.isnan(values) & (codes >= 0)
+    codes, values = codes[keep], values[keep]
+    
+    if values.size:
+        low, high = values.min(), values.max()
+    else:
+        low, high = 0.0, 1.0
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    edges = np.linspace(low, high, nbins + 1)
+    
+    # One bincount over (group, bin) pairs instead of a histogram per group
+    bins = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, nbins - 1)
+    counts = np.bincount(codes * nbins + bins, minlength=len(groups) * nbins)
+    
+    return pd.DataFrame({
+        group: np.repeat(np.asarray(groups), nbins),
+        'bin_start': np.tile(edges[:-1], len(groups)),
+        'bin_center': np.tile((edges[:-1] + edges[1:]) / 2, len(groups)),
+        'bin_width': edges[1] - edges[0],
+        'count': counts
+    })
+
+
+def _count_zeros_by_group(codes, values, n_groups):
+    """
+    Count zero values and total values per group in one pass.
+    
+    Compiled with numba when it is installed; plain Python otherwise.
+    
+    Args:
+        codes (np.ndarray): Dense group code (0..n_groups-1) for every row
+        values (np.ndarray): Value for every row
+        n_groups (int): Number of groups
+    
+    Returns:
+        tuple: (zero_counts, total_counts) as int64 arrays of length n_groups
+    """
+    zero_counts = np.zeros(n_groups, np.int64)
+    total_counts = np.zeros(n_groups, np.int64)
+    for i in range(codes.size):
+        group = codes[i]
+        total_counts[group] += 1
+        if values[i] == 0.0:
+            zero_counts[group] += 1
+    return zero_counts, total_counts
+
+
+if numba is not None:
+    _count_zeros_by_group = numba.njit(cache=True)(_count_zeros_by_group)
+
+
+def _zero_mask(values):
+    """
+    Build a numpy boolean mask of the values that are exactly zero.
+    
+    Arrow-backed columns (pd.ArrowDtype) are compared with pyarrow.compute on
+    the Arrow buffers directly, skipping pandas' dispatch and the nullable
+    BooleanArray it would allocate. Nulls count as non-zero.
+    
+    Args:
+        values (pd.Series): Value column
+    
+    Returns:
+        np.ndarray: Boolean mask, True where the value is 0
+    """
+    if pc is not None and isinstance(values.dtype, pd.ArrowDtype):
+        is_zero = pc.fill_null(pc.equal(pyarrow.array(values.array), 0), False)
+        return is_zero.to_numpy(zero_copy_only=False)
+    return values.to_numpy() == 0
+
+
 def calculate_zero_statistics(timeseries_data):
     """
     Analyze when values are zero for each fruit.
@@ -133,20 +841,37 @@ def calculate_zero_statistics(timeseries_data):
     Returns:
         pd.DataFrame: Statistics about zero values per fruit
     """
-    # Count zeros for each fruit
-    zero_counts = timeseries_data[timeseries_data['value'] == 0].groupby('name').size()
-    total_counts = timeseries_data.groupby('name').size()
+    if numba is not None and len(timeseries_data) >= _NUMBA_MIN_ROWS:
+        # Single compiled pass over dense fruit codes for large frames
+        codes, fruits = pd.factorize(timeseries_data['name'], sort=True)
+        # Rows without a name get code -1; drop them as groupby does
+        named = codes >= 0
+        zero_counts, total_counts = _count_zeros_by_group(
+            codes[named].astype(np.int64),
+            timeseries_data['value'].to_numpy()[named],
+            len(fruits)
+        )
+        zero_analysis = pd.DataFrame(
+            {'Zero Count': zero_counts, 'Total Count': total_counts},
+            index=pd.Index(fruits, name='name')
+        )
+        zero_analysis = zero_analysis[zero_analysis['Total Count'] > 0]
+    else:
+        # Count zeros and totals for each fruit in a single groupby pass
+        is_zero = _zero_mask(timeseries_data['value'])
+        zero_analysis = (
+            timeseries_data.assign(_is_zero=is_zero)
+            .groupby('name', observed=True)['_is_zero']
+            .agg(['sum', 'size'])
+            .rename(columns={'sum': 'Zero Count', 'size': 'Total Count'})
+        )
     
     # Calculate percentage of zeros
-    zero_percentages = (zero_counts / total_counts * 100).fillna(0)
-    
-    # Create a dataframe for display
-    zero_analysis = pd.DataFrame({
-        'Fruit': zero_percentages.index,
-        'Zero Count': zero_counts.reindex(zero_percentages.index, fill_value=0),
-        'Total Count': total_counts.reindex(zero_percentages.index),
-        'Zero Percentage': zero_percentages.round(2).values
-    })
+    zero_analysis['Zero Percentage'] = (
+        zero_analysis['Zero Count'] / zero_analysis['Total Count'] * 100
+    ).round(2)
+    
+    zero_analysis = zero_analysis.reset_index().rename(columns={'name': 'Fruit'})
     
     return zero_analysis
 
@@ -164,10 +889,45 @@ def get_all_fruit_names(datasource_df):
     return datasource_df['name'].tolist()
 
 
+def _format_fruit_statistics(datasource_df, aggregates):
+    """
+    Build the fruit statistics table from per-fruit aggregates.
+    
+    Args:
+        datasource_df (pd.DataFrame): Datasource data with fruit metadata
+        aggregates (pd.DataFrame): Indexed by fruit id with columns
+            [total, zeros, min, max, mean, std]
+    
+    Returns:
+        pd.DataFrame: Statistics table as described in calculate_fruit_statistics
+    """
+    fruits = datasource_df.drop_duplicates('id')
+    aggregates = aggregates.reindex(fruits['id'].to_numpy())
+    
+    total_points = aggregates['total'].fillna(0).astype('int64').to_numpy()
+    zero_count = aggregates['zeros'].fillna(0).astype('int64').to_numpy()
+    non_zero_count = total_points - zero_count
+    has_values = non_zero_count > 0
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        zero_pct = np.where(total_points > 0, zero_count / total_points * 100, 0)
+    
+    fruit_stats = pd.DataFrame({
+        'Fruit': fruits['name'].to_numpy(),
+        'Total Points': total_points,
+        'Non-Zero Points': non_zero_count,
+        'Zero %': np.round(zero_pct, 1)
+    })
+    for column, source in (('Min Value', 'min'), ('Max Value', 'max'),
+                           ('Mean Value', 'mean'), ('Std Dev', 'std')):
+        fruit_stats[column] = np.where(has_values, aggregates[source].to_numpy(dtype='float64'), 0.0)
+    
+    return fruit_stats
+
+
 def calculate_fruit_statistics(datasource_df, timeseries_df):
     """
     Calculate comprehensive statistics for all fruits.
-    Pandas operations.
     
     Args:
         datasource_df (pd.DataFrame): Datasource data with fruit metadata
@@ -178,45 +938,68 @@ def calculate_fruit_statistics(datasource_df, timeseries_df):
             - Fruit: Fruit name
             - Total Points: Number of measurements
             - Non-Zero Points: Active measurements
-            - Zero %: Percentage of zero values
-            - Min Value: Minimum non-zero value
-            - Max Value: Maximum non-zero value
-            - Mean Value: Average non-zero value
-            - Std Dev: Standard deviation of non-zero values
-    """
-    fruit_stats_list = []
-    
-    for fruit_id in datasource_df['id'].unique():
-        fruit_name = datasource_df[datasource_df['id'] == fruit_id]['name'].values[0]
-        fruit_ts = timeseries_df[timeseries_df['datasource_id'] == fruit_id]
-        
-        total_points = len(fruit_ts)
-        zero_count = (fruit_ts['value'] == 0).sum()
-        non_zero_count = total_points - zero_count
-        
-        if non_zero_count > 0:
-            non_zero_values = fruit_ts[fruit_ts['value'] > 0]['value']
-            min_val = non_zero_values.min()
-            max_val = non_zero_values.max()
-            mean_val = non_zero_values.mean()
-            std_val = non_zero_values.std()
-        else:
-            min_val = max_val = mean_val = std_val = 0
-        
-        zero_pct = (zero_count / total_points * 100) if total_points > 0 else 0
-        
-        fruit_stats_list.append({
-            'Fruit': fruit_name,
-            'Total Points': total_points,
-            'Non-Zero Points': non_zero_count,
-            'Zero %': f"{zero_pct:.1f}%",
-            'Min Value': f"{min_val:.2f}",
-            'Max Value': f"{max_val:.2f}",
-            'Mean Value': f"{mean_val:.2f}",
-            'Std Dev': f"{std_val:.2f}"
-        })
+            - Zero %: Percentage of zero values (float, format at display time)
+            - Min Value: Minimum non-zero value (float, format at display time)
+            - Max Value: Maximum non-zero value (float, format at display time)
+            - Mean Value: Average non-zero value (float, format at display time)
+            - Std Dev: Standard deviation of non-zero values (float, format at display time)
+    """
+    return _format_fruit_statistics(datasource_df, _aggregate_fruit_values(timeseries_df))
+
+
+def _zero_run_lengths_loop(is_zero):
+    """
+    Single-pass zero run-length kernel writing into a preallocated array.
+    
+    Compiled with numba when it is installed; plain Python otherwise.
+    
+    Args:
+        is_zero (np.ndarray): Boolean mask, True where the value is 0, in time order
+    
+    Returns:
+        np.ndarray: Length of each zero run (int64), in order of occurrence
+    """
+    lengths = np.empty(is_zero.size // 2 + 1, np.int64)
+    n_runs = 0
+    current = 0
+    for i in range(is_zero.size):
+        if is_zero[i]:
+            current += 1
+        elif current > 0:
+            lengths[n_runs] = current
+            n_runs += 1
+            current = 0
+    if current > 0:
+        lengths[n_runs] = current
+        n_runs += 1
+    return lengths[:n_runs]
+
+
+if numba is not None:
+    _zero_run_lengths_loop = numba.njit(cache=True)(_zero_run_lengths_loop)
+
+
+def _zero_run_lengths(is_zero):
+    """
+    Get the length of every run of consecutive zeros.
+    
+    Run boundaries come from the difference of the padded 0/1 mask, so the
+    scan happens in NumPy rather than a Python loop. Large masks use the
+    numba-compiled single-pass kernel when numba is installed.
+    
+    Args:
+        is_zero (np.ndarray): Boolean mask, True where the value is 0, in time order
+    
+    Returns:
+        np.ndarray: Length of each zero run (int64), in order of occurrence
+    """
+    if numba is not None and is_zero.size >= _NUMBA_MIN_ROWS:
+        return _zero_run_lengths_loop(is_zero)
     
-    return pd.DataFrame(fruit_stats_list)
+    edges = np.diff(is_zero.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return (ends - starts).astype(np.int64)
 
 
 def analyze_zero_patterns(timeseries_data):
@@ -229,53 +1012,48 @@ def analyze_zero_patterns(timeseries_data):
     Returns:
         pd.DataFrame: Detailed zero pattern statistics
     """
-    timeseries_data = timeseries_data.sort_values('timestamp')
+    # One sort puts every fruit's rows in time order; groups are then
+    # contiguous slices and need no re-sorting
+    timeseries_data = timeseries_data.sort_values(['name', 'timestamp'], kind='mergesort')
+    is_zero = _zero_mask(timeseries_data['value'])
+    groups = timeseries_data.groupby('name', sort=False, observed=True).indices
     
-    results = []
+    # Fill preallocated columns instead of building one dict per fruit
+    n_fruits = len(groups)
+    total = np.zeros(n_fruits, dtype=np.int32)
+    zero_count = np.zeros(n_fruits, dtype=np.int32)
+    num_sequences = np.zeros(n_fruits, dtype=np.int32)
+    avg_sequence_length = np.zeros(n_fruits, dtype=np.float64)
+    max_sequence_length = np.zeros(n_fruits, dtype=np.int32)
     
-    for fruit in timeseries_data['name'].unique():
-        fruit_data = timeseries_data[timeseries_data['name'] == fruit].sort_values('timestamp')
+    for i, rows in enumerate(groups.values()):
+        # Each group is one contiguous range of the sorted frame: slice, not gather
+        fruit_is_zero = is_zero[rows[0]:rows[-1] + 1]
         
         # Total and zero counts
-        total = len(fruit_data)
-        zero_count = (fruit_data['value'] == 0).sum()
-        
-        # Find consecutive zero sequences
-        fruit_data_reset = fruit_data.reset_index(drop=True)
-        is_zero = (fruit_data_reset['value'] == 0).values
-        
-        # Detect sequences of zeros
-        zero_sequences = []
-        in_sequence = False
-        seq_start = 0
+        total[i] = fruit_is_zero.size
+        zero_count[i] = np.count_nonzero(fruit_is_zero)
         
-        for idx, val in enumerate(is_zero):
-            if val and not in_sequence:
-                in_sequence = True
-                seq_start = idx
-            elif not val and in_sequence:
-                in_sequence = False
-                zero_sequences.append(idx - seq_start)
-        
-        if in_sequence:
-            zero_sequences.append(len(is_zero) - seq_start)
+        # Find consecutive zero sequences (run-length encoding)
+        zero_sequences = _zero_run_lengths(fruit_is_zero)
         
         # Calculate statistics
-        avg_sequence_length = sum(zero_sequences) / len(zero_sequences) if zero_sequences else 0
-        max_sequence_length = max(zero_sequences) if zero_sequences else 0
-        num_sequences = len(zero_sequences)
-        
-        results.append({
-            'Fruit': fruit,
-            'Total Points': total,
-            'Zero Count': zero_count,
-            'Zero %': round(zero_count / total * 100, 2) if total > 0 else 0,
-            'Zero Sequences': num_sequences,
-            'Avg Seq Length': round(avg_sequence_length, 2),
-            'Max Seq Length': max_sequence_length
-        })
+        num_sequences[i] = zero_sequences.size
+        avg_sequence_length[i] = zero_sequences.mean() if zero_sequences.size else 0
+        max_sequence_length[i] = zero_sequences.max(initial=0)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        zero_pct = np.where(total > 0, zero_count / total * 100, 0)
     
-    return pd.DataFrame(results)
+    return pd.DataFrame({
+        'Fruit': list(groups),
+        'Total Points': total,
+        'Zero Count': zero_count,
+        'Zero %': np.round(zero_pct, 2),
+        'Zero Sequences': num_sequences,
+        'Avg Seq Length': np.round(avg_sequence_length, 2),
+        'Max Seq Length': max_sequence_length
+    })
 
 
 def calculate_correlation_matrix(timeseries_data):
@@ -292,22 +1070,127 @@ def calculate_correlation_matrix(timeseries_data):
     pivot_data = timeseries_data.pivot_table(
         index='timestamp',
         columns='name',
-        values='value'
+        values='value',
+        aggfunc='mean',
+        observed=True
     )
     
-    # Calculate correlation
-    correlation = pivot_data.corr()
+    # float32 is plenty for display-precision correlations and halves the
+    # memory traffic of the matmul below
+    values = pivot_data.to_numpy(dtype=np.float32)
+    
+    # Gaps need pairwise-complete handling, which pandas' corr() provides
+    if np.isnan(values).any():
+        return pivot_data.corr()
+    
+    # Dense matrix: center the columns and let one BLAS matmul do all pairs.
+    # Means and norms accumulate in float64; the products stay float32
+    column_means = values.mean(axis=0, dtype=np.float64)
+    centered = values - column_means.astype(np.float32)
+    norms = np.sqrt(np.einsum('ij,ij->j', centered, centered, dtype=np.float64))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlation = (centered.T @ centered).astype(np.float64) / np.outer(norms, norms)
+    correlation = np.clip(correlation, -1.0, 1.0)
+    np.fill_diagonal(correlation, np.where(norms > 0, 1.0, np.nan))
+    
+    return pd.DataFrame(correlation, index=pivot_data.columns, columns=pivot_data.columns)
+
+
+def get_correlation_pairs(corr_matrix):
+    """
+    List each pair of fruits once with its correlation, strongest first.
+    
+    Args:
+        corr_matrix (pd.DataFrame): Square correlation matrix (fruits x fruits)
+    
+    Returns:
+        pd.DataFrame: Columns [Fruit 1, Fruit 2, Correlation], sorted by
+            absolute correlation (descending, NaN last); the index keeps each
+            pair's position in the upper triangle
+    """
+    # Upper triangle without the diagonal: no duplicates or self-correlation
+    rows, cols = np.triu_indices(len(corr_matrix.columns), k=1)
+    names = pd.Index(corr_matrix.columns.to_numpy())
+    
+    # The triangle indices double as category codes, so no name is copied per pair
+    corr_df = pd.DataFrame({
+        'Fruit 1': pd.Categorical.from_codes(rows, categories=names),
+        'Fruit 2': pd.Categorical.from_codes(cols, categories=names),
+        'Correlation': corr_matrix.to_numpy(dtype=np.float32)[rows, cols]
+    })
+    
+    order = np.argsort(-np.abs(corr_df['Correlation'].to_numpy()), kind='stable')
+    return corr_df.take(order)
+
+
+def build_fruit_summary(timeseries_df):
+    """
+    Summarize every fruit's values in one grouped pass.
+    
+    The result is small (one row per fruit) and is meant to be built once and
+    passed to validate_forecast_data, forecast_with_prophet and
+    predict_zero_values so they skip rescanning the timeseries.
+    
+    Args:
+        timeseries_df (pd.DataFrame): Timeseries data with 'name', 'timestamp', 'value'
+    
+    Returns:
+        pd.DataFrame: Indexed by fruit name with columns
+            [total, count, zeros, non_zero, min, max, mean, time_min, time_max];
+            count excludes NaN values, min/max/mean cover values > 0 only
+    """
+    values = timeseries_df['value']
+    is_positive = values > 0
+    
+    return (
+        timeseries_df.assign(
+            _is_zero=_zero_mask(values),
+            _is_positive=is_positive,
+            _positive=values.where(is_positive)
+        )
+        .groupby('name', sort=False, observed=True)
+        .agg(
+            total=('value', 'size'),
+            count=('value', 'count'),
+            zeros=('_is_zero', 'sum'),
+            non_zero=('_is_positive', 'sum'),
+            min=('_positive', 'min'),
+            max=('_positive', 'max'),
+            mean=('_positive', 'mean'),
+            time_min=('timestamp', 'min'),
+            time_max=('timestamp', 'max')
+        )
+    )
+
+
+def _fruit_summary_row(timeseries_data, fruit_name, summary):
+    """
+    Get one fruit's summary row, from ``summary`` when given.
+    
+    Args:
+        timeseries_data (pd.DataFrame): Timeseries data with 'name', 'timestamp', 'value'
+        fruit_name (str): Fruit name
+        summary (pd.DataFrame or None): Output of build_fruit_summary
     
-    return correlation
+    Returns:
+        pd.Series or None: The fruit's summary row, None if it has no data
+    """
+    if summary is None:
+        summary = build_fruit_summary(timeseries_data[timeseries_data['name'] == fruit_name])
+    if fruit_name not in summary.index:
+        return None
+    return summary.loc[fruit_name]
 
 
-def validate_forecast_data(timeseries_data, fruit_name):
+def validate_forecast_data(timeseries_data, fruit_name, summary=None):
     """
     Validate data before forecasting to provide clear error messages.
     
     Args:
         timeseries_data (pd.DataFrame): Timeseries data
         fruit_name (str): Fruit name to validate
+        summary (pd.DataFrame, optional): Precomputed build_fruit_summary
+            output; skips filtering and scanning timeseries_data
     
     Returns:
         tuple: (is_valid, error_message, metadata)
@@ -316,21 +1199,18 @@ def validate_forecast_data(timeseries_data, fruit_name):
             - metadata (dict): Data statistics if valid
     """
     try:
-        # Filter data for specific fruit
-        fruit_data = timeseries_data[timeseries_data['name'] == fruit_name].copy()
+        stats = _fruit_summary_row(timeseries_data, fruit_name, summary)
         
-        if len(fruit_data) == 0:
+        if stats is None or stats['total'] == 0:
             return False, f"No data found for fruit: {fruit_name}", {}
         
-        fruit_data = fruit_data.sort_values('timestamp')
-        
         # Check total data points
-        total_count = len(fruit_data)
+        total_count = int(stats['total'])
         if total_count < 20:
             return False, f"Insufficient data: only {total_count} points (need ≥20)", {}
         
         # Check non-zero data
-        non_zero_count = (fruit_data['value'] > 0).sum()
+        non_zero_count = int(stats['non_zero'])
         if non_zero_count == 0:
             return False, f"No non-zero values found. Cannot forecast when fruit is always 0.", {}
         
@@ -338,21 +1218,19 @@ def validate_forecast_data(timeseries_data, fruit_name):
             return False, f"Insufficient non-zero data: only {non_zero_count} points (need ≥10)", {}
         
         # Check for NaN values
-        nan_count = fruit_data['value'].isna().sum()
-        if nan_count == total_count:
+        if stats['count'] == 0:
             return False, "All values are NaN - cannot forecast", {}
         
         # Check value range
-        non_zero_values = fruit_data[fruit_data['value'] > 0]['value']
-        min_val = non_zero_values.min()
-        max_val = non_zero_values.max()
+        min_val = stats['min']
+        max_val = stats['max']
         
         if min_val == max_val:
             return False, f"All non-zero values are identical ({min_val}). Cannot establish trend.", {}
         
         # Calculate metrics
         zero_pct = (total_count - non_zero_count) / total_count * 100
-        date_range = (fruit_data['timestamp'].max() - fruit_data['timestamp'].min()).days
+        date_range = (stats['time_max'] - stats['time_min']).days
         
         metadata = {
             'total_points': total_count,
@@ -361,7 +1239,7 @@ def validate_forecast_data(timeseries_data, fruit_name):
             'date_range_days': date_range,
             'value_min': round(min_val, 2),
             'value_max': round(max_val, 2),
-            'value_mean': round(non_zero_values.mean(), 2)
+            'value_mean': round(stats['mean'], 2)
         }
         
         return True, "", metadata
@@ -370,7 +1248,71 @@ def validate_forecast_data(timeseries_data, fruit_name):
         return False, f"Error validating data: {str(e)}", {}
 
 
-def forecast_with_prophet(timeseries_data, fruit_name, periods=30):
+def forecast_methods():
+    """
+    List the forecast methods that can run with the installed libraries.
+    
+    Returns:
+        list: Method names accepted by forecast_with_prophet, Prophet first
+    """
+    methods = ['prophet']
+    if _HAS_STATSMODELS:
+        methods.append('stl')
+    return methods
+
+
+def _fast_forecast(values, dates, periods):
+    """
+    Forecast daily values with an STL decomposition instead of Prophet.
+    
+    The observations are averaged per day, gaps are interpolated, and the
+    series is split into trend, weekly seasonal and residual parts. The
+    forecast extends the trend linearly (slope fitted over the last week)
+    and repeats the last seasonal cycle; bounds are +/- 1.96 residual std.
+    
+    Args:
+        values (array-like): Observed values
+        dates (array-like): Timestamps matching ``values``
+        periods (int): Number of days to forecast
+    
+    Returns:
+        tuple: (forecast_df, result)
+            - forecast_df: DataFrame with 'ds', 'yhat', 'yhat_lower', 'yhat_upper'
+              covering the history and the forecast horizon
+            - result: Fitted STL result
+    
+    Raises:
+        ValueError: If fewer than two weeks of daily data are available
+    """
+    from statsmodels.tsa.seasonal import STL
+    
+    period = 7
+    daily = pd.Series(np.asarray(values, dtype=np.float64), index=pd.DatetimeIndex(dates))
+    daily = daily.resample('D').mean().interpolate(limit_direction='both')
+    if len(daily) < 2 * period:
+        raise ValueError(f"Need at least {2 * period} days of data, got {len(daily)}")
+    
+    result = STL(daily, period=period, robust=True).fit()
+    trend = result.trend.to_numpy()
+    seasonal = result.seasonal.to_numpy()
+    interval = 1.96 * np.nanstd(result.resid.to_numpy())
+    
+    slope = np.polyfit(np.arange(period), trend[-period:], 1)[0]
+    steps = np.arange(1, periods + 1)
+    future = trend[-1] + slope * steps + seasonal[-period:][(steps - 1) % period]
+    
+    yhat = np.concatenate([trend + seasonal, future])
+    ds = daily.index.append(pd.date_range(daily.index[-1], periods=periods + 1, freq='D')[1:])
+    forecast = pd.DataFrame({
+        'ds': ds,
+        'yhat': yhat,
+        'yhat_lower': yhat - interval,
+        'yhat_upper': yhat + interval,
+    })
+    return forecast, result
+
+
+def forecast_with_prophet(timeseries_data, fruit_name, periods=30, method='prophet', summary=None):
     """
     Forecast future values for a fruit using Prophet with zero-value handling.
     
@@ -382,41 +1324,51 @@ def forecast_with_prophet(timeseries_data, fruit_name, periods=30):
        - Realistic: blend of on/off with trend (weighted by active probability)
        - Optimistic: assuming fruit stays "active"
     
+    With ``method='stl'`` the Prophet fit is skipped and the non-zero values
+    are forecast with ``_fast_forecast`` instead, which takes milliseconds
+    rather than seconds and returns a dataframe with the same columns.
+    
     Args:
         timeseries_data (pd.DataFrame): Timeseries data with 'name', 'timestamp', 'value'
         fruit_name (str): Name of the fruit to forecast
         periods (int): Number of days to forecast
+        method (str): 'prophet' (default) or 'stl'
+        summary (pd.DataFrame, optional): Precomputed build_fruit_summary
+            output used for validation and the activity probability
     
     Returns:
         tuple: (forecast_df, model, error_msg) 
             - forecast_df: Forecast dataframe or None if error
-            - model: Trained Prophet model or None if error
+            - model: Trained Prophet model (or STL result) or None if error
             - error_msg: Error message if failed, empty string if successful
     """
     error_msg = ""
     
-    try:
-        from prophet import Prophet
-    except ImportError:
-        return None, None, "Prophet library not installed"
+    if method == 'prophet':
+        if Prophet is None:
+            return None, None, "Prophet library not installed"
+    elif method == 'stl':
+        if not _HAS_STATSMODELS:
+            return None, None, "statsmodels library not installed"
+    else:
+        return None, None, f"Unknown forecast method: {method}"
     
     try:
         # Validate input data first
-        is_valid, validation_error, metadata = validate_forecast_data(timeseries_data, fruit_name)
+        if summary is None:
+            summary = build_fruit_summary(timeseries_data[timeseries_data['name'] == fruit_name])
+        is_valid, validation_error, metadata = validate_forecast_data(timeseries_data, fruit_name, summary)
         if not is_valid:
             return None, None, validation_error
         
-        # Filter data for specific fruit
-        fruit_data = timeseries_data[timeseries_data['name'] == fruit_name].copy()
-        fruit_data = fruit_data.sort_values('timestamp')
-        
         # Calculate activity probability
-        active_count = (fruit_data['value'] > 0).sum()
-        total_count = len(fruit_data)
+        active_count = metadata['non_zero_points']
+        total_count = metadata['total_points']
         active_probability = active_count / total_count if total_count > 0 else 0
         
-        # Separate zero and non-zero data
-        non_zero_data = fruit_data[fruit_data['value'] > 0].copy()
+        # Keep only the fruit's non-zero data, in time order
+        fruit_data = timeseries_data[timeseries_data['name'] == fruit_name]
+        non_zero_data = fruit_data[fruit_data['value'] > 0].sort_values('timestamp')
         
         # Prepare data for Prophet
         prophet_data = pd.DataFrame({
@@ -430,50 +1382,56 @@ def forecast_with_prophet(timeseries_data, fruit_name, periods=30):
         if len(prophet_data) < 5:
             return None, None, f"Not enough valid data points after cleaning ({len(prophet_data)} < 5)"
         
-        # Initialize and fit Prophet model with error handling
-        try:
-            model = Prophet(
-                yearly_seasonality='auto',
-                weekly_seasonality='auto',
-                daily_seasonality='auto',
-                interval_width=0.95,
-                changepoint_prior_scale=0.01,
-                seasonality_prior_scale=10.0,
-                seasonality_mode='additive'
-            )
-            
-            # Suppress Prophet's verbose output
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                model.fit(prophet_data)
+        if method == 'stl':
+            try:
+                forecast, model = _fast_forecast(prophet_data['y'], prophet_data['ds'], periods)
+            except Exception as e:
+                return None, None, f"STL forecast failed: {str(e)}"
+        else:
+            # Initialize and fit Prophet model with error handling
+            try:
+                model = Prophet(
+                    yearly_seasonality='auto',
+                    weekly_seasonality='auto',
+                    daily_seasonality='auto',
+                    interval_width=0.95,
+                    changepoint_prior_scale=0.01,
+                    seasonality_prior_scale=10.0,
+                    seasonality_mode='additive'
+                )
                 
-        except Exception as e:
-            return None, None, f"Prophet model training failed: {str(e)}"
+                # Suppress Prophet's verbose output
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    model.fit(prophet_data)
+                    
+            except Exception as e:
+                return None, None, f"Prophet model training failed: {str(e)}"
+            
+            # Create future dataframe
+            try:
+                future = model.make_future_dataframe(periods=periods)
+            except Exception as e:
+                return None, None, f"Error creating forecast periods: {str(e)}"
+            
+            # Generate forecast
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    forecast = model.predict(future)
+            except Exception as e:
+                return None, None, f"Forecast generation failed: {str(e)}"
         
-        # Create future dataframe
-        try:
-            future = model.make_future_dataframe(periods=periods)
-        except Exception as e:
-            return None, None, f"Error creating forecast periods: {str(e)}"
+        # Post-process forecast to enforce constraints (one in-place max)
+        bounds = ['yhat', 'yhat_lower', 'yhat_upper']
+        clipped = forecast[bounds].to_numpy(dtype=np.float64, copy=True)
+        np.maximum(clipped, 0.0, out=clipped)
+        forecast[bounds] = clipped
         
-        # Generate forecast
-        try:
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                forecast = model.predict(future)
-        except Exception as e:
-            return None, None, f"Forecast generation failed: {str(e)}"
-        
-        # Post-process forecast to enforce constraints
-        forecast['yhat'] = forecast['yhat'].clip(lower=0)
-        forecast['yhat_lower'] = forecast['yhat_lower'].clip(lower=0)
-        forecast['yhat_upper'] = forecast['yhat_upper'].clip(lower=0)
-        
-        # Add activity information and scenarios
+        # Add activity information and scenarios (one broadcast multiply)
         forecast['active_probability'] = active_probability
-        forecast['pessimistic'] = forecast['yhat'] * (1 - active_probability)
-        forecast['realistic'] = forecast['yhat'] * active_probability
-        forecast['optimistic'] = forecast['yhat']
+        weights = np.array([1 - active_probability, active_probability, 1.0])
+        forecast[['pessimistic', 'realistic', 'optimistic']] = clipped[:, :1] * weights
         
         return forecast, model, ""
         
@@ -515,7 +1473,7 @@ def get_forecast_summary(forecast_df):
         return {}
 
 
-def predict_zero_values(timeseries_data, fruit_name, periods=30):
+def predict_zero_values(timeseries_data, fruit_name, periods=30, summary=None):
     """
     Predict which future days a fruit will have zero values using historical patterns.
     
@@ -525,82 +1483,51 @@ def predict_zero_values(timeseries_data, fruit_name, periods=30):
         timeseries_data (pd.DataFrame): Timeseries data with 'name', 'timestamp', 'value'
         fruit_name (str): Name of the fruit to predict for
         periods (int): Number of days to forecast
+        summary (pd.DataFrame, optional): Precomputed build_fruit_summary
+            output; skips filtering and scanning timeseries_data
     
     Returns:
         tuple: (predictions_df, error_msg)
             - predictions_df: DataFrame with columns [date, zero_probability, status]
                 - date: Predicted date
-                - zero_probability: % likelihood fruit will be zero (0-100)
+                - zero_probability: % likelihood fruit will be zero (0-100, numeric)
                 - status: 'Likely Zero' (>60%), 'Likely Active' (<40%), or 'Uncertain' (40-60%)
             - error_msg: Error message if failed, empty string if successful
     """
     try:
-        # Filter data for specific fruit
-        fruit_data = timeseries_data[timeseries_data['name'] == fruit_name].copy()
-
+        stats = _fruit_summary_row(timeseries_data, fruit_name, summary)
+        
         # Control input data
-        if len(fruit_data) < 20:
+        if stats is None or stats['total'] < 20:
             return None, "Not enough historical data (need ≥20 points)"
         
-        fruit_data = fruit_data.sort_values('timestamp')
-        
         # Calculate historical zero probability
-        total_count = len(fruit_data)
-        zero_count = (fruit_data['value'] == 0).sum()
+        total_count = int(stats['total'])
+        zero_count = int(stats['zeros'])
         zero_probability = (zero_count / total_count) if total_count > 0 else 0
         
-        # Detect patterns: sequence length of zeros and non-zeros
-        is_zero = (fruit_data['value'] == 0).values
-        
-        # Find sequences and their lengths
-        sequences = []
-        current_value = is_zero[0]
-        current_len = 1
-        
-        for i in range(1, len(is_zero)):
-            if is_zero[i] == current_value:
-                current_len += 1
-            else:
-                sequences.append({'is_zero': current_value, 'length': current_len})
-                current_value = is_zero[i]
-                current_len = 1
-        sequences.append({'is_zero': current_value, 'length': current_len})
-        
-        # Calculate average sequence length for zeros
-        zero_sequences = [s['length'] for s in sequences if s['is_zero']]
-        avg_zero_seq_len = sum(zero_sequences) / len(zero_sequences) if zero_sequences else 1
-        
         # Generate predictions using a simple probabilistic model
         # Mix historical probability with random variation based on patterns
-        predictions_list = []
-        last_date = pd.to_datetime(fruit_data['timestamp'].max())
+        last_date = pd.to_datetime(stats['time_max'])
+        future_dates = pd.date_range(last_date + pd.Timedelta(days=1), periods=periods, freq='D')
         
-        np.random.seed(42)  # For reproducibility
+        # Draw all the noise at once; this simulates the uncertainty in
+        # predicting zero patterns (seeded for reproducibility)
+        rng = np.random.default_rng(42)
+        noise = rng.normal(0.0, 0.05, size=periods)
+        predicted_prob_pct = np.clip(zero_probability + noise, 0.0, 1.0) * 100.0
         
-        for day_offset in range(1, periods + 1):
-            future_date = last_date + pd.Timedelta(days=day_offset)
-            
-            # Use base probability with small random variation
-            # This simulates the uncertainty in predicting zero patterns
-            noise = np.random.normal(0, 0.05)  # Small noise around base probability
-            predicted_prob = max(0, min(1, zero_probability + noise))
-            predicted_prob_pct = predicted_prob * 100
-            
-            # Categorize prediction
-            if predicted_prob_pct > 60:
-                status = "Likely Zero"
-            elif predicted_prob_pct < 40:
-                status = "Likely Active"
-            else:
-                status = "Uncertain"
-            
-            predictions_list.append({
-                'Date': future_date.strftime('%Y-%m-%d'),
-                'Zero Probability': f"{predicted_prob_pct:.1f}%",
-                'Status': status
-            })
+        # Categorize predictions
+        status = np.where(
+            predicted_prob_pct > 60, "Likely Zero",
+            np.where(predicted_prob_pct < 40, "Likely Active", "Uncertain")
+        )
         
-        predictions_df = pd.DataFrame(predictions_list)
+        predictions_df = pd.DataFrame({
+            'Date': future_dates.strftime('%Y-%m-%d'),
+            'Zero Probability': predicted_prob_pct.round(1),
+            'Status': status
+        })
         
         return predictions_df, ""
         
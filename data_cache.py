@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Data Cache Module
+Streamlit-cached wrappers around data_api, shared by every page so each
+cached result is built once per process instead of once per page
+"""
+
+import streamlit as st
+
+import data_api
+
+
+@st.cache_data  # This decorator caches the data so we don't reload it every time
+def load_bundle():
+    """Wrapper function for caching data and statistics from data_api module."""
+    return data_api.load_bundle()
+
+
+def load_data():
+    """
+    Get the cached datasource and timeseries tables.
+    
+    Returns:
+        tuple: (datasource_df, timeseries_df)
+    """
+    datasource_df, timeseries_df, _, _, _ = load_bundle()
+    return datasource_df, timeseries_df
+
+
+@st.cache_data
+def all_fruit_names():
+    """
+    Get every fruit name, in datasource order, built once.
+    
+    Returns:
+        tuple: Fruit names (a tuple, so callers cannot mutate the shared list)
+    """
+    datasource_df, _ = load_data()
+    return tuple(data_api.get_all_fruit_names(datasource_df))
+
+
+@st.cache_data
+def datasource_with_means():
+    """
+    Get the datasource table with each fruit's mean value, computed once.
+    
+    Returns:
+        pd.DataFrame: Datasource data with additional 'mean_value' column
+    """
+    datasource_df, timeseries_df = load_data()
+    return data_api.merge_datasource_with_mean(datasource_df, timeseries_df)
+
+
+@st.cache_data
+def name_to_id():
+    """
+    Get the fruit name -> id lookup, built once.
+    
+    Returns:
+        dict: {fruit name: fruit id}
+    """
+    datasource_df, _ = load_data()
+    return data_api.get_name_to_id(datasource_df)
+
+
+@st.cache_data
+def fruit_summary():
+    """
+    Get the per-fruit value summary used by the Oracle forecasters, built once.
+    
+    Returns:
+        pd.DataFrame: Output of data_api.build_fruit_summary
+    """
+    _, timeseries_df = load_data()
+    return data_api.build_fruit_summary(timeseries_df)
+
+
+@st.cache_data
+def timeseries_for_fruits(fruit_names):
+    """
+    Get the timeseries rows (with names) for a set of fruits, cached per set.
+    
+    Args:
+        fruit_names (tuple or None): Fruit names; pass a sorted tuple so the
+            same selection always hits the same cache entry, or None for all fruits
+    
+    Returns:
+        pd.DataFrame: Output of data_api.get_timeseries_for_fruits
+    """
+    datasource_df, timeseries_df, fruit_offsets, _, _ = load_bundle()
+    return data_api.get_timeseries_for_fruits(
+        timeseries_df,
+        datasource_df,
+        None if fruit_names is None else list(fruit_names),
+        name_to_id=name_to_id(),
+        fruit_offsets=fruit_offsets
+    )
+
+
+@st.cache_data
+def zero_patterns(fruit_names):
+    """
+    Get the zero pattern table for a set of fruits, cached per set.
+    
+    Args:
+        fruit_names (tuple or None): Same key as timeseries_for_fruits
+    
+    Returns:
+        pd.DataFrame: Output of data_api.analyze_zero_patterns
+    """
+    return data_api.analyze_zero_patterns(timeseries_for_fruits(fruit_names))
+
+
+@st.cache_data
+def correlation_matrix(fruit_names):
+    """
+    Get the correlation matrix for a set of fruits, cached per set.
+    
+    Args:
+        fruit_names (tuple or None): Same key as timeseries_for_fruits
+    
+    Returns:
+        pd.DataFrame: Output of data_api.calculate_correlation_matrix
+    """
+    return data_api.calculate_correlation_matrix(timeseries_for_fruits(fruit_names))
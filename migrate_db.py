@@ -0,0 +1,38 @@
+"""
+One-off migration that adds the read indexes used by data_api to db.sqlite.
+
+The app only reads the database, so run this once after replacing the
+database file:
+
+    $ python migrate_db.py [path/to/db.sqlite]
+"""
+import sqlite3
+import sys
+
+
+INDEXES = (
+    # Covering index: per-fruit aggregates are answered from index pages alone
+    "CREATE INDEX IF NOT EXISTS ix_ts_dsid_value ON timeseries(datasource_id, value)",
+    "CREATE INDEX IF NOT EXISTS ix_ds_name ON datasource(name)"
+)
+
+
+def migrate(db_path="db.sqlite"):
+    """
+    Create the missing read indexes and refresh the planner statistics.
+    
+    Args:
+        db_path (str): Path to the SQLite database file
+    """
+    connection = sqlite3.connect(db_path)
+    try:
+        with connection:
+            for sql in INDEXES:
+                connection.execute(sql)
+            connection.execute("ANALYZE")
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    migrate(sys.argv[1] if len(sys.argv) > 1 else "db.sqlite")
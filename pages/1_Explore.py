@@ -8,23 +8,134 @@ Visualize individual fruits and their patterns
 
 import streamlit as st
 import plotly.express as px
+import plotly.graph_objects as go
 import pandas as pd
 import data_api
+import data_cache
 
 st.set_page_config(page_title="Explore", layout="wide")
 
+# Above this many fruits the correlation section waits for an explicit opt-in:
+# the matrix, heatmap and pair table all grow with the square of the selection
+CORR_LIMIT = 50
+
 st.title("Explore Fruits")
 
 st.markdown("""
 Select one or more fruits to explore their patterns through interactive visualizations.
 """)
 
-# Load data
-@st.cache_data
-def load_data():
-    return data_api.load_data()
+# ============================================================================
+# CACHED FIGURES
+# ============================================================================
+# Each figure depends only on the fruit selection, so it is built once per
+# selection. cache_resource hands back the same figure object on every rerun
+# (no pickling or re-validation); the page only reads it.
+
+@st.cache_resource(max_entries=32)
+def positions_figure(fruit_names):
+    """Scatterplot of fruit positions, sized by mean value."""
+    fruits = data_api.filter_by_fruit_names(data_cache.datasource_with_means(), fruit_names)
+    return px.scatter(
+        fruits,
+        x='x',
+        y='y',
+        size='mean_value',
+        color='name',
+        hover_data=['name', 'x', 'y', 'mean_value'],
+        title='Fruit Positions (X, Y Coordinates) - Size = Mean Value',
+        labels={'x': 'X Coordinate', 'y': 'Y Coordinate', 'mean_value': 'Mean Value'},
+        width=800,
+        height=600,
+        size_max=50,
+        render_mode='webgl' if len(fruits) > 500 else 'svg'
+    )
+
+
+@st.cache_resource(max_entries=32)
+def timeseries_figures(fruit_names):
+    """Line chart over time and value histogram for a set of fruits."""
+    merged_data = data_cache.timeseries_for_fruits(fruit_names)
+    
+    # Lines only need each fruit's visual envelope, not every point
+    fig_timeseries = px.line(
+        data_api.downsample_for_plot(merged_data),
+        x='timestamp',
+        y='value',
+        color='name',
+        title='Fruit Values Over Time',
+        labels={'timestamp': 'Date', 'value': 'Value', 'name': 'Fruit'},
+        hover_data=['name', 'value'],
+        render_mode='webgl'
+    )
+    
+    fig_timeseries.update_layout(
+        hovermode='x unified',
+        height=500
+    )
+    
+    # Bin on the server: the chart gets 50 bars per fruit instead of every value
+    value_bins = data_api.histogram_by_group(merged_data, nbins=50)
+    fig_hist = px.bar(
+        value_bins,
+        x='bin_center',
+        y='count',
+        color='name',
+        title='Distribution of Values',
+        labels={'bin_center': 'Value', 'count': 'Frequency'},
+        barmode='overlay',
+        opacity=0.7
+    )
+    if not value_bins.empty:
+        fig_hist.update_traces(width=value_bins['bin_width'].iloc[0])
+    fig_hist.update_layout(bargap=0)
+    
+    return fig_timeseries, fig_hist
+
 
-datasource_df, timeseries_df = load_data()
+@st.cache_resource(max_entries=32)
+def zero_patterns_figure(fruit_names):
+    """Grouped bar chart of zero counts and zero sequences per fruit."""
+    return px.bar(
+        data_cache.zero_patterns(fruit_names),
+        x='Fruit',
+        y=['Zero Count', 'Zero Sequences'],
+        barmode='group',
+        title='Zero Occurrences and Sequences per Fruit',
+        labels={'value': 'Count', 'variable': 'Metric'}
+    )
+
+
+@st.cache_resource(max_entries=32)
+def correlation_heatmap(fruit_names):
+    """Annotated heatmap of the correlation matrix."""
+    corr_matrix = data_cache.correlation_matrix(fruit_names)
+    
+    # Create a simple scatter-based heatmap with clear text
+    fig_heatmap = go.Figure(data=go.Heatmap(
+        z=corr_matrix.values,
+        x=corr_matrix.columns,
+        y=corr_matrix.index,
+        colorscale='RdBu',
+        zmid=0,
+        zmin=-1,
+        zmax=1,
+        text=corr_matrix.values.round(2),
+        texttemplate='%{text:.2f}',
+        textfont={"size": 12},
+        hovertemplate='%{y} vs %{x}<br>Correlation: %{z:.3f}<extra></extra>'
+    ))
+    
+    fig_heatmap.update_layout(
+        title='Fruit Correlation Heatmap',
+        height=650,
+        width=750,
+        xaxis={'tickangle': -45},
+        yaxis={'autorange': 'reversed'},
+        margin={'b': 150}
+    )
+    
+    return fig_heatmap
 
 # ============================================================================
 # FRUIT SELECTOR AND SCATTERPLOT
@@ -33,7 +144,7 @@ datasource_df, timeseries_df = load_data()
 st.header("Fruit Positions & Mean Values")
 
 # Create a multiselect widget for choosing fruits
-all_fruits = data_api.get_all_fruit_names(datasource_df)
+all_fruits = list(data_cache.all_fruit_names())
 
 # Add "Select All" option
 fruit_options = ["Select All"] + all_fruits
@@ -44,19 +155,24 @@ selected_options = st.multiselect(
     default=["Select All"]
 )
 
-# Handle "Select All" logic
+# Handle "Select All" logic; selection_key is the cache key for timeseries
+# lookups, None meaning "every fruit" so no row filtering is needed
 if "Select All" in selected_options:
     selected_fruits = all_fruits
+    selection_key = None
 else:
     selected_fruits = selected_options
+    selection_key = tuple(sorted(selected_fruits))
 
 if len(selected_fruits) > 0:
-    # Filter the datasource dataframe to only show selected fruits
-    filtered_datasource = data_api.filter_by_fruit_names(datasource_df, selected_fruits)
-    
-    # Calculate mean value for each fruit
-    mean_values = data_api.calculate_mean_values(timeseries_df)
-    filtered_with_means = filtered_datasource.merge(mean_values, on='id', how='left')
+    # Filter the (cached) datasource-with-means table to only show selected fruits
+    if selection_key is None:
+        filtered_with_means = data_cache.datasource_with_means()
+    else:
+        filtered_with_means = data_api.filter_by_fruit_names(
+            data_cache.datasource_with_means(),
+            selected_fruits
+        )
 
     # Defaults to keep variables bound even when we short-circuit
     exclude_zeros = False
@@ -103,14 +219,10 @@ if len(selected_fruits) > 0:
 
         # Apply filters
         if exclude_zeros:
-            # Get fruits that have non-zero values
-            merged_data_temp = data_api.get_timeseries_for_fruits(
-                timeseries_df,
-                datasource_df,
-                selected_fruits
-            )
-            fruits_with_nonzero = merged_data_temp[merged_data_temp['value'] != 0]['name'].unique().tolist()
-            filtered_with_means = filtered_with_means[filtered_with_means['name'].isin(fruits_with_nonzero)]
+            # Get fruits that have non-zero values (from the cached per-fruit summary)
+            fruit_summary = data_cache.fruit_summary()
+            fruits_with_nonzero = fruit_summary.index[fruit_summary['zeros'] < fruit_summary['total']]
+            filtered_with_means = data_api.filter_by_fruit_names(filtered_with_means, fruits_with_nonzero)
         
         # Filter by mean value range
         filtered_with_means = filtered_with_means[
@@ -122,26 +234,13 @@ if len(selected_fruits) > 0:
         st.subheader(f"Selected Fruits: {len(filtered_with_means)}")
         st.dataframe(filtered_with_means)
         
+        # Get filtered fruit names for the scatterplot and time series analysis
+        filtered_fruit_names = filtered_with_means['name'].tolist()
+        
         # Create an interactive scatterplot using Plotly
         st.subheader("Scatterplot: X vs Y Coordinates")
-        fig = px.scatter(
-            filtered_with_means,
-            x='x',
-            y='y',
-            size='mean_value',
-            color='name',
-            hover_data=['name', 'x', 'y', 'mean_value'],
-            title='Fruit Positions (X, Y Coordinates) - Size = Mean Value',
-            labels={'x': 'X Coordinate', 'y': 'Y Coordinate', 'mean_value': 'Mean Value'},
-            width=800,
-            height=600,
-            size_max=50
-        )
-        
+        fig = positions_figure(tuple(sorted(filtered_fruit_names)))
         st.plotly_chart(fig, use_container_width=True)
-        
-        # Get filtered fruit names for time series analysis
-        filtered_fruit_names = filtered_with_means['name'].tolist()
     
     # ============================================================================
     # TIME-SERIES VISUALIZATION
@@ -150,51 +249,20 @@ if len(selected_fruits) > 0:
     st.header("Time-Series Analysis")
     
     if len(filtered_fruit_names) > 0:
-        # Get timeseries data for filtered fruits with names merged in
-        merged_data = data_api.get_timeseries_for_fruits(
-            timeseries_df,
-            datasource_df,
-            filtered_fruit_names
-        )
+        # Show some stats about the time range, from the cached per-fruit
+        # summary so the rows themselves are only touched by the figure builders
+        selected_summary = data_cache.fruit_summary().reindex(filtered_fruit_names)
+        st.write(f"**Time range:** {selected_summary['time_min'].min()} to {selected_summary['time_max'].max()}")
+        st.write(f"**Total data points:** {int(selected_summary['total'].sum()):,}")
         
-        # Show some stats about the time range
-        st.write(f"**Time range:** {merged_data['timestamp'].min()} to {merged_data['timestamp'].max()}")
-        st.write(f"**Total data points:** {len(merged_data):,}")
+        fig_timeseries, fig_hist = timeseries_figures(tuple(sorted(filtered_fruit_names)))
         
         # Create line chart showing values over time
         st.subheader("Value Over Time")
-        
-        fig_timeseries = px.line(
-            merged_data,
-            x='timestamp',
-            y='value',
-            color='name',
-            title='Fruit Values Over Time',
-            labels={'timestamp': 'Date', 'value': 'Value', 'name': 'Fruit'},
-            hover_data=['name', 'value']
-        )
-        
-        fig_timeseries.update_layout(
-            hovermode='x unified',
-            height=500
-        )
-        
         st.plotly_chart(fig_timeseries, use_container_width=True)
         
         # Show distribution of values
         st.subheader("Value Distribution")
-        
-        fig_hist = px.histogram(
-            merged_data,
-            x='value',
-            color='name',
-            title='Distribution of Values',
-            labels={'value': 'Value', 'count': 'Frequency'},
-            nbins=50,
-            barmode='overlay',
-            opacity=0.7
-        )
-        
         st.plotly_chart(fig_hist, use_container_width=True)
     else:
         st.info("No fruits match the selected filters.")
@@ -212,15 +280,8 @@ Understanding when and how fruits go to zero is critical for prediction.
 """)
 
 if len(selected_fruits) > 0:
-    # Get all timeseries data for selected fruits
-    merged_all = data_api.get_timeseries_for_fruits(
-        timeseries_df,
-        datasource_df,
-        selected_fruits
-    )
-    
-    # Analyze zero patterns
-    zero_patterns = data_api.analyze_zero_patterns(merged_all)
+    # Analyze zero patterns (cached per fruit selection)
+    zero_patterns = data_cache.zero_patterns(selection_key)
     
     st.subheader("Zero Pattern Statistics")
     st.dataframe(zero_patterns)
@@ -237,14 +298,7 @@ if len(selected_fruits) > 0:
     # Visualize zero sequence lengths
     st.subheader("Zero Sequence Patterns")
     
-    fig_zero = px.bar(
-        zero_patterns,
-        x='Fruit',
-        y=['Zero Count', 'Zero Sequences'],
-        barmode='group',
-        title='Zero Occurrences and Sequences per Fruit',
-        labels={'value': 'Count', 'variable': 'Metric'}
-    )
+    fig_zero = zero_patterns_figure(selection_key)
     st.plotly_chart(fig_zero, use_container_width=True)
 
 else:
@@ -260,16 +314,17 @@ st.markdown("""
 Which fruits move together? Correlation analysis reveals dependencies and relationships.
 """)
 
-if len(selected_fruits) > 1:
-    # Get all timeseries data
-    merged_all = data_api.get_timeseries_for_fruits(
-        timeseries_df,
-        datasource_df,
-        selected_fruits
+compute_correlation = len(selected_fruits) <= CORR_LIMIT
+if len(selected_fruits) > CORR_LIMIT:
+    st.info(
+        f"{len(selected_fruits)} fruits selected: the correlation analysis covers "
+        f"every pair, so it is skipped above {CORR_LIMIT} fruits."
     )
-    
-    # Calculate correlation matrix
-    corr_matrix = data_api.calculate_correlation_matrix(merged_all)
+    compute_correlation = st.checkbox("Compute correlations anyway", value=False)
+
+if len(selected_fruits) > 1 and compute_correlation:
+    # Calculate correlation matrix (cached per fruit selection)
+    corr_matrix = data_cache.correlation_matrix(selection_key)
     
     st.subheader("Correlation Matrix")
     
@@ -281,32 +336,7 @@ if len(selected_fruits) > 1:
     """)
     
     # Display as heatmap using scatter-based approach
-    import plotly.graph_objects as go
-    
-    # Create a simple scatter-based heatmap with clear text
-    fig_heatmap = go.Figure(data=go.Heatmap(
-        z=corr_matrix.values,
-        x=corr_matrix.columns,
-        y=corr_matrix.index,
-        colorscale='RdBu',
-        zmid=0,
-        zmin=-1,
-        zmax=1,
-        text=corr_matrix.values.round(2),
-        texttemplate='%{text:.2f}',
-        textfont={"size": 12},
-        hovertemplate='%{y} vs %{x}<br>Correlation: %{z:.3f}<extra></extra>'
-    ))
-    
-    fig_heatmap.update_layout(
-        title='Fruit Correlation Heatmap',
-        height=650,
-        width=750,
-        xaxis={'tickangle': -45},
-        yaxis={'autorange': 'reversed'},
-        margin={'b': 150}
-    )
-    
+    fig_heatmap = correlation_heatmap(selection_key)
     st.plotly_chart(fig_heatmap, use_container_width=True)
     
     st.subheader("Correlation Matrix (Table)")
@@ -315,19 +345,10 @@ if len(selected_fruits) > 1:
     # Find strongest correlations
     st.subheader("Strongest Relationships")
     
-    # Get upper triangle of correlation matrix (avoid duplicates and self-correlation)
-    corr_pairs = []
-    for i in range(len(corr_matrix.columns)):
-        for j in range(i+1, len(corr_matrix.columns)):
-            corr_pairs.append({
-                'Fruit 1': corr_matrix.columns[i],
-                'Fruit 2': corr_matrix.columns[j],
-                'Correlation': corr_matrix.iloc[i, j]
-            })
-    
-    corr_df = pd.DataFrame(corr_pairs).sort_values('Correlation', ascending=False, key=abs)
+    # Each pair once (upper triangle), strongest correlation first
+    corr_df = data_api.get_correlation_pairs(corr_matrix)
     
     st.dataframe(corr_df)
     
-else:
+elif len(selected_fruits) <= 1:
     st.info("Select at least 2 fruits to see correlation analysis.")
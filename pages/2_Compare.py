@@ -9,6 +9,7 @@ Compare two fruits side-by-side
 import streamlit as st
 import plotly.express as px
 import data_api
+import data_cache
 
 st.set_page_config(page_title="Compare", layout="wide")
 
@@ -18,12 +19,39 @@ st.markdown("""
 Select two different fruits to see a detailed side-by-side comparison.
 """)
 
-# Load data
-@st.cache_data
-def load_data():
-    return data_api.load_data()
 
-datasource_df, timeseries_df = load_data()
+@st.cache_resource(max_entries=32)
+def comparison_figures(fruit1, fruit2):
+    """
+    Build the line chart and box plot for a pair of fruits, once per pair.
+    
+    cache_resource hands back the same figure objects on every rerun (no
+    pickling or re-validation); the page only reads them.
+    """
+    comparison_data = data_cache.timeseries_for_fruits(tuple(sorted([fruit1, fruit2])))
+    
+    fig_compare = px.line(
+        data_api.downsample_for_plot(comparison_data),
+        x='timestamp',
+        y='value',
+        color='name',
+        title=f'{fruit1} vs {fruit2} Over Time',
+        labels={'timestamp': 'Date', 'value': 'Value'},
+        markers=True,
+        render_mode='webgl'
+    )
+    fig_compare.update_layout(hovermode='x unified', height=400)
+    
+    fig_box = px.box(
+        comparison_data,
+        x='name',
+        y='value',
+        title='Value Distribution by Fruit',
+        labels={'name': 'Fruit', 'value': 'Value'}
+    )
+    
+    return fig_compare, fig_box
+
 
 # Create two columns for selecting two fruits to compare
 comp_col1, comp_col2 = st.columns(2)
@@ -31,14 +59,14 @@ comp_col1, comp_col2 = st.columns(2)
 with comp_col1:
     fruit1 = st.selectbox(
         "Select first fruit:",
-        options=data_api.get_all_fruit_names(datasource_df),
+        options=data_cache.all_fruit_names(),
         key="fruit1_select"
     )
 
 with comp_col2:
     fruit2 = st.selectbox(
         "Select second fruit:",
-        options=data_api.get_all_fruit_names(datasource_df),
+        options=data_cache.all_fruit_names(),
         key="fruit2_select"
     )
 
@@ -46,31 +74,19 @@ with comp_col2:
 if fruit1 != fruit2:
     st.subheader(f"Comparing: {fruit1} vs {fruit2}")
     
-    # Get timeseries data for both fruits
-    comparison_data = data_api.get_timeseries_for_fruits(
-        timeseries_df,
-        datasource_df,
-        [fruit1, fruit2]
-    )
+    # Get timeseries data for both fruits (cached per pair, shared with Explore)
+    comparison_data = data_cache.timeseries_for_fruits(tuple(sorted([fruit1, fruit2])))
+    
+    fig_compare, fig_box = comparison_figures(fruit1, fruit2)
     
     # Create side-by-side comparison: line chart
     st.write("**Time-Series Comparison**")
-    fig_compare = px.line(
-        comparison_data,
-        x='timestamp',
-        y='value',
-        color='name',
-        title=f'{fruit1} vs {fruit2} Over Time',
-        labels={'timestamp': 'Date', 'value': 'Value'},
-        markers=True
-    )
-    fig_compare.update_layout(hovermode='x unified', height=400)
     st.plotly_chart(fig_compare, use_container_width=True)
     
     # Create comparison stats table
     st.write("**Statistical Comparison**")
     
-    comparison_stats = comparison_data.groupby('name')['value'].describe().round(4)
+    comparison_stats = comparison_data.groupby('name', observed=True)['value'].describe().round(4)
     st.dataframe(comparison_stats)
     
     # Show zero value comparison
@@ -81,13 +97,6 @@ if fruit1 != fruit2:
     
     # Create box plot for distribution comparison
     st.write("**Value Distribution Comparison**")
-    fig_box = px.box(
-        comparison_data,
-        x='name',
-        y='value',
-        title='Value Distribution by Fruit',
-        labels={'name': 'Fruit', 'value': 'Value'}
-    )
     st.plotly_chart(fig_box, use_container_width=True)
     
 else:
@@ -8,7 +8,9 @@ Predictions and pattern analysis using machine learning
 
 import streamlit as st
 import plotly.graph_objects as go
+import numpy as np
 import data_api
+import data_cache
 
 st.set_page_config(page_title="Oracle", layout="wide")
 
@@ -18,12 +20,24 @@ st.markdown("""
 Use machine learning to forecast future fruit values and uncover hidden patterns.
 """)
 
-# Load data
-@st.cache_data
-def load_data():
-    return data_api.load_data()
+# Load data (cached and shared with the other pages)
+datasource_df, timeseries_df, fruit_offsets, all_fruit_stats_df, _ = data_cache.load_bundle()
+fruit_summary = data_cache.fruit_summary()
+
+
+def show_data_quality(metadata):
+    """Render the data quality metrics from validate_forecast_data in one row."""
+    metrics = [
+        ("Total Points", metadata.get('total_points', 'N/A')),
+        ("Non-Zero Points", metadata.get('non_zero_points', 'N/A')),
+        ("Zero %", f"{metadata.get('zero_percentage', 0):.1f}%"),
+    ]
+    if 'date_range_days' in metadata:
+        metrics.append(("Date Range", f"{metadata['date_range_days']} days"))
+    
+    for col, (label, value) in zip(st.columns(len(metrics)), metrics):
+        col.metric(label, value)
 
-datasource_df, timeseries_df = load_data()
 
 # ============================================================================
 # FORECASTING WITH PROPHET
@@ -53,7 +67,7 @@ col1, col2, col3 = st.columns(3)
 with col1:
     fruit_to_forecast = st.selectbox(
         "Select fruit to forecast:",
-        options=data_api.get_all_fruit_names(datasource_df)
+        options=data_cache.all_fruit_names()
     )
 
 with col2:
@@ -64,6 +78,12 @@ with col2:
         value=30,
         step=7
     )
+    forecast_method = st.radio(
+        "Model:",
+        options=data_api.forecast_methods(),
+        format_func=lambda m: {"prophet": "Prophet", "stl": "Fast (STL)"}[m],
+        horizontal=True
+    )
 
 with col3:
     run_forecast = st.button("Run Forecast", type="primary")
@@ -75,7 +95,8 @@ if run_forecast:
             fruit_data = data_api.get_timeseries_for_fruits(
                 timeseries_df,
                 datasource_df,
-                [fruit_to_forecast]
+                [fruit_to_forecast],
+                fruit_offsets=fruit_offsets
             )
             
             if fruit_data is None or len(fruit_data) == 0:
@@ -84,26 +105,23 @@ if run_forecast:
                 # Validate data before forecasting
                 is_valid, validation_error, metadata = data_api.validate_forecast_data(
                     fruit_data,
-                    fruit_to_forecast
+                    fruit_to_forecast,
+                    summary=fruit_summary
                 )
                 
                 if not is_valid:
                     st.error(f"Cannot forecast {fruit_to_forecast}: {validation_error}")
                     if metadata:
                         st.info("Data Statistics:")
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            st.metric("Total Points", metadata.get('total_points', 'N/A'))
-                        with col2:
-                            st.metric("Non-Zero Points", metadata.get('non_zero_points', 'N/A'))
-                        with col3:
-                            st.metric("Zero %", f"{metadata.get('zero_percentage', 0):.1f}%")
+                        show_data_quality(metadata)
                 else:
                     # Run forecast
                     forecast_df, model, error_msg = data_api.forecast_with_prophet(
                         fruit_data,
                         fruit_to_forecast,
-                        periods=forecast_periods
+                        periods=forecast_periods,
+                        method=forecast_method,
+                        summary=fruit_summary
                     )
                     
                     if forecast_df is not None and error_msg == "":
@@ -111,29 +129,28 @@ if run_forecast:
                         
                         # Show data quality info
                         with st.expander("Data Quality", expanded=False):
-                            col1, col2, col3, col4 = st.columns(4)
-                            with col1:
-                                st.metric("Total Points", metadata.get('total_points', 'N/A'))
-                            with col2:
-                                st.metric("Non-Zero Points", metadata.get('non_zero_points', 'N/A'))
-                            with col3:
-                                st.metric("Zero %", f"{metadata.get('zero_percentage', 0):.1f}%")
-                            with col4:
-                                st.metric("Date Range", f"{metadata.get('date_range_days', 0)} days")
+                            show_data_quality(metadata)
                         
                         # Extract historical and forecast data
-                        historical_data = fruit_data[fruit_data['name'] == fruit_to_forecast].copy()
-                        historical_data = historical_data.sort_values('timestamp')
+                        # fruit_data holds only this fruit and is only read below;
+                        # rows normally arrive in time order already
+                        historical_data = fruit_data
+                        if not historical_data['timestamp'].is_monotonic_increasing:
+                            historical_data = historical_data.sort_values('timestamp')
                         
                         # Create forecast visualization
                         st.subheader(f"Forecast: {fruit_to_forecast}")
                         
+                        # Convert the date columns to numpy datetime64 once and
+                        # reuse them across all traces
+                        historical_ds = historical_data['timestamp'].to_numpy('datetime64[ms]')
+                        
                         fig = go.Figure()
                         
                         # Add historical data
                         fig.add_trace(go.Scatter(
-                            x=historical_data['timestamp'],
-                            y=historical_data['value'],
+                            x=historical_ds,
+                            y=historical_data['value'].to_numpy(),
                             mode='lines',
                             name='Historical',
                             line=dict(color='#1f77b4', width=2)
@@ -141,36 +158,41 @@ if run_forecast:
                         
                         # Add forecast
                         forecast_future = forecast_df[forecast_df['ds'] > historical_data['timestamp'].max()]
+                        future_ds = forecast_future['ds'].to_numpy('datetime64[ms]')
                         
                         # Add three scenario lines
                         fig.add_trace(go.Scatter(
-                            x=forecast_future['ds'],
-                            y=forecast_future['optimistic'],
+                            x=future_ds,
+                            y=forecast_future['optimistic'].to_numpy(),
                             mode='lines',
                             name='Optimistic (Stays Active)',
                             line=dict(color='#2ca02c', width=2, dash='solid')
                         ))
                         
                         fig.add_trace(go.Scatter(
-                            x=forecast_future['ds'],
-                            y=forecast_future['realistic'],
+                            x=future_ds,
+                            y=forecast_future['realistic'].to_numpy(),
                             mode='lines',
                             name='Realistic (Blended)',
                             line=dict(color='#ff7f0e', width=3, dash='solid')
                         ))
                         
                         fig.add_trace(go.Scatter(
-                            x=forecast_future['ds'],
-                            y=forecast_future['pessimistic'],
+                            x=future_ds,
+                            y=forecast_future['pessimistic'].to_numpy(),
                             mode='lines',
                             name='Pessimistic (Follows History)',
                             line=dict(color='#d62728', width=2, dash='dash')
                         ))
                         
                         # Add confidence interval for optimistic scenario
+                        # (upper edge forward, lower edge back, as one polygon)
                         fig.add_trace(go.Scatter(
-                            x=forecast_future['ds'].tolist() + forecast_future['ds'].tolist()[::-1],
-                            y=forecast_future['yhat_upper'].tolist() + forecast_future['yhat_lower'].tolist()[::-1],
+                            x=np.concatenate([future_ds, future_ds[::-1]]),
+                            y=np.concatenate([
+                                forecast_future['yhat_upper'].to_numpy(),
+                                forecast_future['yhat_lower'].to_numpy()[::-1]
+                            ]),
                             fill='toself',
                             fillcolor='rgba(44, 160, 44, 0.1)',
                             line=dict(color='rgba(255,255,255,0)'),
@@ -248,7 +270,8 @@ if run_forecast:
                         zero_predictions_df, zero_error_msg = data_api.predict_zero_values(
                             fruit_data,
                             fruit_to_forecast,
-                            periods=forecast_periods
+                            periods=forecast_periods,
+                            summary=fruit_summary
                         )
                         
                         if zero_predictions_df is not None and zero_error_msg == "":
@@ -261,9 +284,8 @@ if run_forecast:
                                 'Uncertain': '#ff7f0e'         # Orange
                             }
                             
-                            # Convert percentage strings to floats for plotting
-                            zero_probs = zero_predictions_df['Zero Probability'].str.rstrip('%').astype(float)
-                            colors = [prediction_colors[status] for status in zero_predictions_df['Status']]
+                            zero_probs = zero_predictions_df['Zero Probability']
+                            colors = zero_predictions_df['Status'].map(prediction_colors).tolist()
                             
                             fig_zero = go.Figure()
                             
@@ -294,7 +316,14 @@ if run_forecast:
                             
                             # Display prediction table
                             st.subheader("Zero Prediction Details")
-                            st.dataframe(zero_predictions_df, use_container_width=True, hide_index=True)
+                            st.dataframe(
+                                zero_predictions_df,
+                                use_container_width=True,
+                                hide_index=True,
+                                column_config={
+                                    "Zero Probability": st.column_config.NumberColumn("Zero Probability", format="%.1f%%")
+                                }
+                            )
                             
                             # Summary statistics
                             st.subheader("Zero Prediction Summary")
@@ -332,10 +361,18 @@ st.divider()
 st.subheader(f"Statistics for {fruit_to_forecast if run_forecast else 'Selected Fruit'}")
 
 # Use the fruit from forecast if available, otherwise show a placeholder
-selected_fruit = fruit_to_forecast if run_forecast else data_api.get_all_fruit_names(datasource_df)[0]
-fruit_stats_df = data_api.calculate_fruit_statistics(
-    datasource_df[datasource_df['name'] == selected_fruit], 
-    timeseries_df
-)
+selected_fruit = fruit_to_forecast if run_forecast else data_cache.all_fruit_names()[0]
+fruit_stats_df = all_fruit_stats_df[all_fruit_stats_df['Fruit'] == selected_fruit]
 
-st.dataframe(fruit_stats_df, use_container_width=True, hide_index=True)
+st.dataframe(
+    fruit_stats_df,
+    use_container_width=True,
+    hide_index=True,
+    column_config={
+        "Zero %": st.column_config.NumberColumn("Zero %", format="%.1f%%"),
+        "Min Value": st.column_config.NumberColumn("Min Value", format="%.2f"),
+        "Max Value": st.column_config.NumberColumn("Max Value", format="%.2f"),
+        "Mean Value": st.column_config.NumberColumn("Mean Value", format="%.2f"),
+        "Std Dev": st.column_config.NumberColumn("Std Dev", format="%.2f"),
+    }
+)
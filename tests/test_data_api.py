@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_api
+
+
+def _sample_tables():
+    datasource_df = pd.DataFrame({
+        'id': np.array([1, 2], dtype=np.int32),
+        'name': pd.Categorical(['Apple', 'Banana']),
+        'x': np.array([0.0, 1.0], dtype=np.float32),
+        'y': np.array([0.0, 1.0], dtype=np.float32),
+    })
+    timeseries_df = pd.DataFrame({
+        'datasource_id': np.array([1, 1, 1, 2, 2], dtype=np.int32),
+        'timestamp': pd.date_range('2024-01-01', periods=5, freq='D'),
+        'value': np.array([0.0, 1.0, 2.0, 3.0, 4.0], dtype=np.float32),
+    })
+    return datasource_df, timeseries_df
+
+
+def test_duplicate_fruit_names_select_rows_once():
+    datasource_df, timeseries_df = _sample_tables()
+    name_to_id = data_api.get_name_to_id(datasource_df)
+
+    result = data_api.get_timeseries_for_fruits(
+        timeseries_df, datasource_df, ['Apple', 'Apple'], name_to_id=name_to_id,
+        fruit_offsets=data_api.fruit_row_offsets(timeseries_df)
+    )
+
+    assert len(result) == 3
+    assert (result['name'] == 'Apple').all()
+
+
+def test_subset_datasource_selects_only_its_fruits():
+    datasource_df, timeseries_df = _sample_tables()
+    apple_only = datasource_df[datasource_df['name'] == 'Apple']
+
+    result = data_api.get_timeseries_for_fruits(timeseries_df, apple_only, ['Apple'])
+
+    assert len(result) == 3
+    assert (result['name'] == 'Apple').all()
+
+
+def test_selection_covering_every_fruit_returns_whole_table():
+    datasource_df, timeseries_df = _sample_tables()
+
+    result = data_api.get_timeseries_for_fruits(
+        timeseries_df, datasource_df, ['Banana', 'Apple'],
+        fruit_offsets=data_api.fruit_row_offsets(timeseries_df)
+    )
+
+    assert len(result) == len(timeseries_df)
+
+
+def test_zero_mask_on_arrow_backed_values():
+    pa = pytest.importorskip('pyarrow')
+    values = pd.Series([0.0, 1.5, None, 0.0], dtype=pd.ArrowDtype(pa.float32()))
+
+    mask = data_api._zero_mask(values)
+
+    assert isinstance(mask, np.ndarray)
+    assert mask.tolist() == [True, False, False, True]
+
+
+def test_zero_mask_on_numpy_values():
+    values = pd.Series([0.0, 1.5, np.nan, 0.0], dtype=np.float32)
+
+    assert data_api._zero_mask(values).tolist() == [True, False, False, True]